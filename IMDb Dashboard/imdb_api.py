@@ -6,18 +6,80 @@ Description: The primary API for interacting with the IMDb dataset.
 
 # Import necessary packages
 import pandas as pd
+import numpy as np
 import matplotlib.pyplot as plt
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.feather as feather
+from pathlib import Path
+from collections import OrderedDict
+from functools import cached_property
+
+# Define maximum number of filtered datasets to keep cached
+FILTER_CACHE_SIZE = 32
+
+# Define version of prepared data stored in feather cache metadata. Increment whenever prepare_data changes columns or
+# column types so caches written by older versions are rebuilt instead of loaded.
+CACHE_VERSION = b'2'
+CACHE_VERSION_KEY = b'imdb_api_cache_version'
 
 # Define API class
 class IMDB_API:
 
     imdb = None  # dataframe
+    _prepared = False  # whether 'Gross', 'Released_Year', and 'Runtime' are already numeric
+
+    def __init__(self):
+        self._filter_cache = OrderedDict()  # (year_range, genre_selection, min_votes) --> filtered dataframe
+        self._fig, self._ax = plt.subplots(figsize = (6, 6))  # single figure reused by every plot
 
     def load_imdb(self, filename):
         '''
-        Load in dataset as pandas dataframe
+        Load in dataset as pandas dataframe. If a prepared feather cache of the dataset exists, is at least as new as
+        the csv file, and was written by the current CACHE_VERSION, load the cache instead to skip csv parsing and data
+        preparation.
         '''
+        # Clear cached genres and filtered datasets from any previously loaded data
+        self._clear_caches()
+
+        csv_path = Path(filename)
+        cache_path = csv_path.with_suffix('.feather')
+
+        # Load already-typed columns directly from cache if it is up to date with the csv file and prepare_data
+        if (cache_path.exists() and cache_path.stat().st_mtime >= csv_path.stat().st_mtime
+                and self._cache_version(cache_path) == CACHE_VERSION):
+            self.imdb = pd.read_feather(cache_path)
+            self._prepared = True
+            self._build_filter_arrays()
+            return
+
+        # Otherwise, parse csv file, prepare data, and write cache (tagged with CACHE_VERSION) for future launches
+        # (skip writing cache if directory is not writable)
         self.imdb = pd.read_csv(filename)
+        self._prepared = False
+        self.prepare_data()
+        self.imdb.reset_index(drop = True, inplace = True)
+        table = pa.Table.from_pandas(self.imdb, preserve_index = False)
+        table = table.replace_schema_metadata({**table.schema.metadata, CACHE_VERSION_KEY: CACHE_VERSION})
+        try:
+            feather.write_feather(table, cache_path)
+        except OSError:
+            pass
+
+
+    @staticmethod
+    def _cache_version(cache_path):
+        '''
+        Read and return version stored in feather cache metadata without loading data (None if cache has no version
+        or cannot be read)
+        '''
+        try:
+            with pa.memory_map(str(cache_path)) as source:
+                metadata = pa.ipc.open_file(source).schema.metadata or {}
+        except (OSError, pa.ArrowInvalid):
+            return None
+
+        return metadata.get(CACHE_VERSION_KEY)
 
 
     def get_columns(self):
@@ -32,45 +94,94 @@ class IMDB_API:
         Convert 'Gross', 'Released_Year', and 'Runtime' data into usable numeric data
         for analysis
         '''
-        # Remove commas from 'Gross' column, convert to numeric data, and remove NaN values
-        self.imdb['Gross'] = self.imdb['Gross'].replace(',', '', regex = True)
-        self.imdb['Gross'] = pd.to_numeric(self.imdb['Gross'], errors = 'coerce')
-        self.imdb.dropna(subset = ['Gross'], inplace = True)
+        # Skip preparation if data is already numeric (loaded from cache or previously prepared)
+        if self._prepared:
+            return
 
-        # Convert 'Released_Year' column to numeric data and remove NaN values. Convert column back to integers.
+        # Convert each column to numeric data in a single pass. Remove commas from 'Gross' column (plain string
+        # replace, no regex) and extract digits from 'Runtime' column (drops ' min').
+        self.imdb['Gross'] = pd.to_numeric(self.imdb['Gross'].str.replace(',', '', regex = False), errors = 'coerce')
         self.imdb['Released_Year'] = pd.to_numeric(self.imdb['Released_Year'], errors = 'coerce')
-        self.imdb.dropna(subset = ['Released_Year'], inplace = True)
-        self.imdb['Released_Year'] = self.imdb['Released_Year'].astype(int)
+        self.imdb['Runtime'] = pd.to_numeric(self.imdb['Runtime'].str.extract(r'(\d+)', expand = False),
+                                             errors = 'coerce')
+
+        # Remove NaN values from all three columns at once. Convert 'Released_Year' and 'Runtime' back to integers.
+        # Use smallest integer types that fit the data ('No_of_Votes' max is ~2.3 million) so filtering scans less
+        # memory.
+        self.imdb.dropna(subset = ['Gross', 'Released_Year', 'Runtime'], inplace = True)
+        self.imdb['Released_Year'] = self.imdb['Released_Year'].astype('int16')
+        self.imdb['Runtime'] = self.imdb['Runtime'].astype('int16')
+        self.imdb['No_of_Votes'] = self.imdb['No_of_Votes'].astype('int32')
 
-        # Remove 'min' and whitespace from 'Runtime' column, convert to numeric data, and remove NaN values
-        self.imdb['Runtime'] = self.imdb['Runtime'].str.replace(' min', '', regex = False)
-        self.imdb['Runtime'] = pd.to_numeric(self.imdb['Runtime'], errors = 'coerce')
-        self.imdb.dropna(subset = ['Runtime'], inplace = True)
+        # Store text columns as pyarrow-backed strings so string operations in widget callbacks run over contiguous
+        # arrow buffers instead of python objects
+        for column in ['Genre', 'Series_Title', 'Overview', 'Certificate', 'Director']:
+            self.imdb[column] = self.imdb[column].astype('string[pyarrow]')
 
+        self._prepared = True
+        self._clear_caches()
+        self._build_filter_arrays()
 
-    def get_unique_genres(self):
+
+    def _clear_caches(self):
         '''
-        Get and return list of unique genres from dataset
+        Clear cached unique genres and filtered datasets (needed whenever underlying data changes)
         '''
-        # Split genres into lists and explode dataframe to get unique genres (documentation help from ChatGPT)
-        unique_genres = self.imdb['Genre'].str.split(',').explode().str.strip().unique()
+        self.__dict__.pop('unique_genres', None)
+        self._filter_cache.clear()
 
-        return sorted(unique_genres.tolist())
+
+    def _build_filter_arrays(self):
+        '''
+        Precompute numpy arrays of year and vote data, as well as a boolean mask for each unique genre marking which
+        rows contain that genre, for use in filtering
+        '''
+        self._years = self.imdb['Released_Year'].to_numpy()
+        self._votes = self.imdb['No_of_Votes'].to_numpy()
+        self._genre_masks = {genre: self.imdb['Genre'].str.contains(genre, regex = False, na = False).to_numpy(bool)
+                             for genre in self.unique_genres}
+
+
+    @cached_property
+    def unique_genres(self):
+        '''
+        Get and return list of unique genres from dataset (computed once and cached until data changes)
+        '''
+        # Split genres into lists, flatten, and strip whitespace using pyarrow compute functions to get unique genres
+        # without creating a python list per row
+        genres = pc.list_flatten(pc.split_pattern(pa.array(self.imdb['Genre']), ','))
+        unique_genres = pc.unique(pc.drop_null(pc.utf8_trim_whitespace(genres)))
+
+        return sorted(unique_genres.to_pylist())
 
 
     def filter_data(self, year_range, genre_selection, min_votes_slider):
         '''
-        Filter data by year, genre, and vote selections and return filtered dataset
+        Filter data by year, genre, and vote selections and return filtered dataset. Filtered datasets are cached by
+        selection so the plot and table tabs reuse the same result for identical widget values.
         '''
-        # Filter data
-        filtered_data = self.imdb[(self.imdb['Released_Year'] >= year_range[0]) &
-                                 (self.imdb['Released_Year'] <= year_range[1])]
-        if genre_selection:
-            # Combine selected genres (separated by '|') and filter data if 'Genre' column contains those genre(s)
-            # (documentation help from ChatGPT)
-            pattern = '|'.join(genre_selection)
-            filtered_data = filtered_data[filtered_data['Genre'].str.contains(pattern, na = False)]
-        filtered_data = filtered_data[filtered_data['No_of_Votes'] >= min_votes_slider]
+        # Return cached filtered data if these selections have already been filtered
+        key = (tuple(year_range), tuple(sorted(genre_selection)), int(min_votes_slider))
+        if key in self._filter_cache:
+            self._filter_cache.move_to_end(key)
+            return self._filter_cache[key]
+
+        # Filter data by year and votes with a single combined mask
+        mask = (self._years >= year_range[0]) & (self._years <= year_range[1]) & (self._votes >= min_votes_slider)
+
+        if not genre_selection:
+            # No genres selected (dashboard default): skip genre masks entirely, and skip copying data if every row
+            # passes the year and vote conditions (default widget values)
+            filtered_data = self.imdb if mask.all() else self.imdb.iloc[mask]
+        else:
+            # Combine selected genres by OR-ing their precomputed genre masks
+            mask = mask & np.logical_or.reduce([self._genre_masks[genre] for genre in genre_selection])
+            filtered_data = self.imdb.iloc[mask]
+
+        # Cache filtered data and remove least recently used entry if cache is full
+        self._filter_cache[key] = filtered_data
+        if len(self._filter_cache) > FILTER_CACHE_SIZE:
+            self._filter_cache.popitem(last = False)
 
         return filtered_data
 
@@ -85,47 +196,47 @@ class IMDB_API:
         if data is None:
             data = self.imdb
 
-        # Clear current figure
-        plt.clf()
-
-        # Create new figure
-        plt.figure(figsize=(width / 100, height / 100))
+        # Clear reused axes and resize figure
+        ax = self._ax
+        ax.clear()
+        self._fig.set_size_inches(width / 100, height / 100)
 
         # Create plot_type
         if plot_type == 'Scatterplot':
-            plt.scatter(data[x_axis], data[y_axis], alpha = 0.7, color = color, edgecolor = edgecolor)
+            ax.scatter(data[x_axis], data[y_axis], alpha = 0.7, color = color, edgecolor = edgecolor)
             # Specify x-label for 'Runtime' to include units. For other columns, remove underscore from column name for
             # x-label and y-label. Use same method for title.
             if x_axis == 'Runtime':
-                plt.xlabel('Runtime (mins)')
+                ax.set_xlabel('Runtime (mins)')
             else:
-                plt.xlabel(x_axis.replace('_', ' '))
-            plt.ylabel(y_axis.replace('_', ' '))
-            plt.title(f'Scatter Plot of {y_axis.replace('_', ' ')} vs {x_axis.replace('_', ' ')}')
+                ax.set_xlabel(x_axis.replace('_', ' '))
+            ax.set_ylabel(y_axis.replace('_', ' '))
+            ax.set_title(f'Scatter Plot of {y_axis.replace('_', ' ')} vs {x_axis.replace('_', ' ')}')
 
         elif plot_type == 'Barplot':
-            data.groupby(x_axis)[y_axis].mean().plot(kind = 'bar', color = color, edgecolor = edgecolor)
+            (data.groupby(x_axis, observed = True)[y_axis].mean()
+                 .plot(kind = 'bar', ax = ax, color = color, edgecolor = edgecolor))
             # Specify y-label for 'Gross' to include units. For other columns, remove underscore from column name
             # (x-labels) and add 'Average' (y-labels). Use same method for title.
-            plt.xlabel(x_axis.replace('_', ' '))
+            ax.set_xlabel(x_axis.replace('_', ' '))
             if y_axis == 'Gross':
-                plt.ylabel('Average Gross (hundred millions)')
+                ax.set_ylabel('Average Gross (hundred millions)')
             else:
-                plt.ylabel(f'Average {y_axis.replace('_', ' ')}')
-            plt.title(f'Bar Plot of Average {y_axis.replace('_', ' ')} by {x_axis.replace('_', ' ')}')
+                ax.set_ylabel(f'Average {y_axis.replace('_', ' ')}')
+            ax.set_title(f'Bar Plot of Average {y_axis.replace('_', ' ')} by {x_axis.replace('_', ' ')}')
 
         elif plot_type == 'Histogram':
-            plt.hist(data[y_axis].dropna(), bins = 20, alpha = 0.7, color = color, edgecolor = edgecolor)
+            ax.hist(data[y_axis].dropna(), bins = 20, alpha = 0.7, color = color, edgecolor = edgecolor)
             # For x-label, remove underscore from y-axis column name. Specify y-label as 'Frequency' of y_axis data.
             # Use same method for title.
-            plt.xlabel(y_axis.replace('_', ' '))
-            plt.ylabel('Frequency')
-            plt.title(f'Histogram of {y_axis.replace('_', ' ')}')
+            ax.set_xlabel(y_axis.replace('_', ' '))
+            ax.set_ylabel('Frequency')
+            ax.set_title(f'Histogram of {y_axis.replace('_', ' ')}')
 
         # Set x-tick rotation default value to horizontal
-        plt.xticks(rotation = 0)
+        ax.tick_params(axis = 'x', labelrotation = 0)
 
-        return plt.gcf()
+        return self._fig
 
 
 def main():
@@ -144,7 +255,7 @@ def main():
     imdb_api.prepare_data()
 
     # Get and display unique genres
-    unique_genres = imdb_api.get_unique_genres()
+    unique_genres = imdb_api.unique_genres
     print('Unique genres: ', unique_genres, '\n')
 
     # Sample filter data and display filtered data
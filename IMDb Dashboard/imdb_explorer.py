@@ -6,8 +6,6 @@ Description: The main application for creating interactive dashboard for IMDb da
 
 # Import necessary packages
 import panel as pn
-import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
 from imdb_api import IMDB_API
 
@@ -37,7 +35,7 @@ y_axis_selection = pn.widgets.Select(name = 'Y-axis: ', options = [], value = ap
 # Implement widgets to restrict plotting data based on respective column max and min values or all column values (genre)
 year_range = pn.widgets.IntRangeSlider(name = 'Year range: ', start = 1920, end = 2020, value = (1920, 2020), step = 1)
 min_votes_slider = pn.widgets.IntSlider(name = 'Minimum votes: ', start = 25000, end = 2343200, value = 0, step = 1)
-genre_selection = pn.widgets.MultiSelect(name = 'Genre(s): ', options = api.get_unique_genres(), value = [],
+genre_selection = pn.widgets.MultiSelect(name = 'Genre(s): ', options = api.unique_genres, value = [],
                                          margin = (5, 0, 10, 10))
 
 # Plotting widgets:
@@ -103,14 +101,12 @@ def update_axis_options(plot_type):
     update_selection(y_axis_selection.value, y_options, y_axis_selection)
 
 
-def generate_table(x_axis_selection, y_axis_selection, year_range, min_votes_slider, genre_selection,
-                   include_series_checkbox, include_overview_checkbox):
+def generate_table(x_axis_selection, y_axis_selection, filtered_data, include_series_checkbox,
+                   include_overview_checkbox):
     '''
-    Generate and return datatable in 'Table' tab of dashboard based on selections
+    Generate and return datatable in 'Table' tab of dashboard based on selections (filtered_data is the dataset
+    filtered by year, genre, and vote conditions)
     '''
-    # Filter data by year, genre, and vote conditions
-    filtered_data = api.filter_data(year_range, genre_selection, min_votes_slider)
-
     # If filtered data is empty (no data meets all conditions), return error message
     if filtered_data.empty:
         return pn.pane.Markdown('### No data found matching the selected criteria.')
@@ -124,53 +120,49 @@ def generate_table(x_axis_selection, y_axis_selection, year_range, min_votes_sli
 
     # Handle histogram plots where x_axis_selection is None by calculating y_axis_selection frequency for table
     if x_axis_selection is None:
-        frequency_data = filtered_data[y_axis_selection].value_counts().reset_index()
-        frequency_data.columns = [y_axis_selection, 'Frequency']
-        local = frequency_data.dropna()
-
-        # Include title and/or overview if checkbox is checked by merging local dataframe with filtered_data
+        # Include title and/or overview if checkbox is checked
         additional_columns = []
         if include_series_checkbox:
             additional_columns.append('Series_Title')
         if include_overview_checkbox:
             additional_columns.append('Overview')
 
-        if additional_columns:
-            # documentation help from ChatGPT
-            merge_columns = [y_axis_selection] + additional_columns
-            local = pd.merge(local, filtered_data[merge_columns].dropna(), on = y_axis_selection, how = 'left')
+        # Calculate frequency of each y_axis_selection value along with its first title and/or overview in a single
+        # grouped pass (NaN values are dropped by groupby). Sort by frequency to match value_counts order.
+        aggregations = {'Frequency': (y_axis_selection, 'size')}
+        for column in additional_columns:
+            aggregations[column] = (column, 'first')
+        local = (filtered_data.groupby(y_axis_selection, sort = False, observed = True).agg(**aggregations)
+                 .reset_index().sort_values('Frequency', ascending = False, kind = 'stable'))
     else:
         # If x_axis_selection or y_axis_selection are not valid, print error message
         if x_axis_selection not in api.imdb.columns or y_axis_selection not in api.imdb.columns:
             print(f'Selected values are not in dataframe columns: {x_axis_selection}, {y_axis_selection}')
         # If x_axis_selection and y_axis_selection are valid, add x_axis_selection to columns with y_axis_selection
         columns.insert(0, x_axis_selection)
-        local = filtered_data[columns].dropna()
 
         # Include title and/or overview if checkbox is checked
-        if include_series_checkbox or include_overview_checkbox:
-            additional_columns = []
-            if include_series_checkbox:
-                additional_columns.append('Series_Title')
-            if include_overview_checkbox:
-                additional_columns.append('Overview')
-
-            if additional_columns:
-                local = pd.concat([local, filtered_data[additional_columns]], axis = 1)
-
-    # Create and return datatable
-    table = pn.widgets.Tabulator(local, selectable = False, show_index = False, pagination = None)
+        additional_columns = []
+        if include_series_checkbox:
+            additional_columns.append('Series_Title')
+        if include_overview_checkbox:
+            additional_columns.append('Overview')
+
+        # Select all table columns in one projection, dropping rows only where x- or y-axis data is missing
+        local = filtered_data[columns + additional_columns].dropna(subset = columns)
+
+    # Create and return datatable (paginate remotely so only the visible page is sent to the browser)
+    table = pn.widgets.Tabulator(local, selectable = False, show_index = False, pagination = 'remote', page_size = 25)
     return table
 
 
-def generate_plot(plot_type, x_axis_selection, y_axis_selection, year_range, min_votes_slider, genre_selection, width,
-                  height, color_picker, border_checkbox, tilt_x_ticks, x_tick_font_size, show_all_x_ticks,
-                  tick_skip_slider):
+def generate_plot(plot_type, x_axis_selection, y_axis_selection, filtered_data, width, height, color_picker,
+                  border_checkbox, tilt_x_ticks, x_tick_font_size, show_all_x_ticks, tick_skip_slider):
     '''
-    Generate and return plot in 'Plot' tab of dashboard based on selections
+    Generate and return plot in 'Plot' tab of dashboard based on selections (filtered_data is the dataset filtered by
+    year, genre, and vote conditions)
     '''
-    # Clear current plot and update axis options
-    plt.clf()
+    # Update axis options
     update_axis_options(plot_type)
 
     # Ensure x_axis_selection is valid if appropriate. If not valid, set to default value to avoid error.
@@ -178,9 +170,6 @@ def generate_plot(plot_type, x_axis_selection, y_axis_selection, year_range, min
         if x_axis_selection is None or x_axis_selection not in ['Released_Year', 'Runtime', 'Genre']:
             x_axis_selection = 'Released_Year'
 
-    # Filter data by year, genre, and vote conditions
-    filtered_data = api.filter_data(year_range, genre_selection, min_votes_slider)
-
     # If filtered data is empty (no data meets all conditions), return error message
     if filtered_data.empty:
         return pn.pane.Markdown('### No data found matching the selected criteria.')
@@ -196,37 +185,43 @@ def generate_plot(plot_type, x_axis_selection, y_axis_selection, year_range, min
         plot_figure = api.create_plot(plot_type, width, height, y_axis = y_axis_selection, data = filtered_data,
                                       color = color_picker, edgecolor = edgecolor)
 
-    # Get current axis
-    ax = plt.gca()
+    # Get plot axis
+    ax = plot_figure.axes[0]
 
     # If wanting to show all x-ticks, use get_xticks() for tick locations. Force x-tick locations to be integers.
     tick_locations = ax.get_xticks()
     int_tick_locations = np.arange(int(min(tick_locations)), int(max(tick_locations)) + 1)
-    plt.xticks(ticks = int_tick_locations, fontsize = x_tick_font_size)
+    ax.set_xticks(int_tick_locations)
+    ax.tick_params(axis = 'x', labelsize = x_tick_font_size)
 
     # If not wanting to show all x-ticks, calculate new tick locations to skip tick_skip_slider values (documentation
     # help from ChatGPT)
     if not show_all_x_ticks and tick_skip_slider > 1:
         int_tick_locations = [loc for i, loc in enumerate(int_tick_locations) if i % tick_skip_slider == 0]
-        plt.xticks(ticks = int_tick_locations, fontsize = x_tick_font_size)
+        ax.set_xticks(int_tick_locations)
 
     # Rotate x-ticks if tilt_x_ticks is checked
     if tilt_x_ticks:
-        plt.xticks(rotation = 45)
+        ax.tick_params(axis = 'x', labelrotation = 45)
 
-    return pn.pane.Matplotlib(plot_figure)
+    return pn.pane.Matplotlib(plot_figure, tight = True)
 
 
 # CALLBACK BINDINGS (Connecting widgets to callback functions)
 
+# Bind filtered data to search widgets. Panel calls filter_data once for each callback that uses it, so the second call
+# for the same selections is served from filter_data's cache. Use throttled slider values so data is only filtered once
+# a slider is released instead of on every tick while dragging.
+filtered_data = pn.bind(api.filter_data, year_range.param.value_throttled, genre_selection,
+                        min_votes_slider.param.value_throttled)
+
 # Bind datatable to widgets
-datatable = pn.bind(generate_table, x_axis_selection, y_axis_selection, year_range, min_votes_slider,
-                    genre_selection, include_series_checkbox, include_overview_checkbox)
+datatable = pn.bind(generate_table, x_axis_selection, y_axis_selection, filtered_data, include_series_checkbox,
+                    include_overview_checkbox)
 
 # Bind plot to widgets
-plot = pn.bind(generate_plot, plot_type, x_axis_selection, y_axis_selection, year_range, min_votes_slider,
-               genre_selection, width, height, color_picker, border_checkbox, tilt_x_ticks, x_tick_font_size,
-               show_all_x_ticks, tick_skip_slider)
+plot = pn.bind(generate_plot, plot_type, x_axis_selection, y_axis_selection, filtered_data, width, height, color_picker,
+               border_checkbox, tilt_x_ticks, x_tick_font_size, show_all_x_ticks, tick_skip_slider)
 
 
 # DASHBOARD WIDGET CONTAINERS ("CARDS")
@@ -0,0 +1,29 @@
+"""
+file: build_font_cache.py
+
+Description: One-off script to build matplotlib's font cache ahead of time (e.g. during environment or container
+setup) so the first run of lyricool_app.py doesn't stall while matplotlib scans and parses system fonts. To reuse a
+prebuilt cache from another location, point the MPLCONFIGDIR environment variable at that directory before running
+this script and the app.
+
+"""
+
+# import necessary packages
+import matplotlib
+matplotlib.use('Agg')  # use non-interactive backend so the cache can be built without a display
+import matplotlib.pyplot as plt
+from matplotlib import font_manager
+
+
+def main():
+
+    # importing font_manager builds (or loads) the font cache. draw one figure to also warm the default font lookup.
+    fig = plt.figure()
+    fig.text(0.5, 0.5, 'Lyricool')
+    fig.canvas.draw()
+    plt.close(fig)
+    print(f'Matplotlib font cache ({len(font_manager.fontManager.ttflist)} fonts) saved to {matplotlib.get_cachedir()}')
+
+
+if __name__ == '__main__':
+    main()
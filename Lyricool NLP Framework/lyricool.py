@@ -8,12 +8,14 @@ of interest, although a custom parser may be useful if pulling from website (suc
 
 # import necessary packages
 import random as rnd
+import re
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import matplotlib
 matplotlib.use('TkAgg')  # use TkAgg as the backend for interactive plots (plots open in new window for clarity)
 import matplotlib.pyplot as plt
+from matplotlib.lines import Line2D
 import os
 os.environ['TOKENIZERS_PARALLELISM'] = 'false' # (used ChatGPT to help manage huggingface warning)
 import warnings
@@ -22,25 +24,58 @@ from collections import defaultdict, Counter
 from textblob import TextBlob
 from transformers import pipeline
 from math import ceil
+from importlib.util import find_spec
+from functools import lru_cache
+from threading import Lock
 
 
 # define global variables
 STOPWORDS_FILE = 'stopwords.txt'
+EMOTION_MODEL = 'j-hartmann/emotion-english-distilroberta-base'
+QUANTIZED_EMOTION_MODEL_DIR = 'emo_int8'  # int8 ONNX model created by quantize_emotion_model.py
+NON_ALPHANUMERIC = re.compile(r'[^\w\s]|_')  # any character that is not a letter, digit, or whitespace
+
+
+@lru_cache(maxsize = 4)
+def _load_stopwords(stopwords_file):
+    """ Read stopwords file once and cache resulting frozenset of stopwords for all future calls with same file. """
+    with open(stopwords_file, 'r') as file:
+        return frozenset(line.strip().lower() for line in file if line.strip())
 
 
 class Lyricool:
 
+    # emotion classifier shared by all instances (loaded on first use, lock prevents parallel parsers loading it twice)
+    _classifier = None
+    _classifier_lock = Lock()
+
     def __init__(self):
         """ Constructor (ex: datakey --> (filelabel --> datavalue)). """
         self.data = defaultdict(dict)
 
 
+    @classmethod
+    def _get_classifier(cls):
+        """ Load emotion classification pipeline once and return it for all future emotion analysis. Use int8-quantized
+        ONNX model if it has been created (and optimum is installed), otherwise use original model. """
+        with cls._classifier_lock:
+            if cls._classifier is None:
+                if os.path.isdir(QUANTIZED_EMOTION_MODEL_DIR) and find_spec('optimum'):
+                    from optimum.onnxruntime import ORTModelForSequenceClassification
+                    from transformers import AutoTokenizer
+                    model = ORTModelForSequenceClassification.from_pretrained(QUANTIZED_EMOTION_MODEL_DIR,
+                                                                              file_name = 'model_quantized.onnx')
+                    tokenizer = AutoTokenizer.from_pretrained(QUANTIZED_EMOTION_MODEL_DIR)
+                    cls._classifier = pipeline('text-classification', model = model, tokenizer = tokenizer)
+                else:
+                    cls._classifier = pipeline('text-classification', model = EMOTION_MODEL, device = 0)
+        return cls._classifier
+
+
     @staticmethod
     def load_stop_words(stopwords_file):
-        """ Load in stopwords file and return list of stopwords for future filtering. """
-        with open(stopwords_file, 'r') as file:
-            stopwords = [line.strip().lower() for line in file if line.strip()]
-            return stopwords
+        """ Load in stopwords file and return set of stopwords for future filtering (file is only read once). """
+        return _load_stopwords(stopwords_file)
 
 
     def default_preprocessor(self, filename, stopwords_file=None):
@@ -50,18 +85,13 @@ class Lyricool:
             # open and read lyrics file
             with open(filename, 'r') as file:
                 text = file.read()
-                words = text.split()
 
-                # clean lyrics (remove unnecessary whitespace, punctuation, and capitalization) (used ChatGPT for char
-                # syntax)
-                cleaned_lyrics = []
-                for word in words:
-                    cleaned_word = ''.join(char for char in word if char.isalpha() or char.isdigit())
-                    cleaned_lyrics.append(cleaned_word.lower())
-                clean_lyrics = ' '.join(cleaned_lyrics)
+                # clean lyrics (remove punctuation and capitalization) using a single precompiled regex pass over the
+                # whole text
+                clean_lyrics = NON_ALPHANUMERIC.sub('', text).lower()
 
                 # filter out stopwords
-                stopwords = set()
+                stopwords = frozenset()
                 if stopwords_file:
                     stopwords = self.load_stop_words(stopwords_file)
                 filtered_lyrics = ' '.join(word for word in clean_lyrics.split() if word not in stopwords)
@@ -74,57 +104,66 @@ class Lyricool:
             raise LyricoolParsingError(f'An error occurred while preprocessing the file: {e}', filename)
 
 
+    def _analyze_lyrics(self, text, filtered_lyrics):
+        """ Calculate word statistics and sentiment for pre-processed text (lyrics) and return results dictionary
+        (emotions are filled in separately by the emotion classifier). """
+        results = {
+            'word_count': Counter(),
+            'num_words': rnd.randrange(10, 50),
+            'avg_word_length': 0,
+            'unique_word_count': 0,
+            'type_token_ratio': 0,
+            'sentiment': '',
+            'polarity': 0,
+            'subjectivity': 0,
+            'emotions': {},
+        }
+
+        words = filtered_lyrics.split()
+
+        # calculate word count (single counting pass over words). derive all remaining word statistics from word
+        # count instead of re-scanning words (unique words are word count keys).
+        word_count = Counter(words)
+        num_words = len(words)
+        unique_word_count = len(word_count)
+        results['word_count'] = word_count
+
+        # calculate total words
+        results['num_words'] = num_words
+
+        # calculate average word length (sum lengths over unique words, weighted by their counts)
+        total_characters = sum(len(word) * count for word, count in word_count.items())
+        results['avg_word_length'] = total_characters / num_words if num_words > 0 else 0
+
+        # calculate unique word count
+        results['unique_word_count'] = unique_word_count
+
+        # calculate type-token ratio (number of unique words / total number of words)
+        results['type_token_ratio'] = unique_word_count / num_words if num_words > 0 else 0
+
+        # conduct sentiment analysis using TextBlob (used ChatGPT for TextBlob syntax)
+        blob = TextBlob(text)
+        results['polarity'] = blob.sentiment.polarity
+        results['subjectivity'] = blob.sentiment.subjectivity
+        if blob.sentiment.polarity > 0:
+            results['sentiment'] = 'Positive'
+        elif blob.sentiment.polarity < 0:
+            results['sentiment'] = 'Negative'
+        else:
+            results['sentiment'] = 'Neutral'
+        return results
+
+
     def default_parser(self, filename):
         """ Parse standard text file of lyrics and produce extracted data results in the form of a dictionary. """
         try:
-            results = {
-                'word_count': Counter(),
-                'num_words': rnd.randrange(10, 50),
-                'avg_word_length': 0,
-                'unique_word_count': 0,
-                'type_token_ratio': 0,
-                'sentiment': '',
-                'polarity': 0,
-                'subjectivity': 0,
-                'emotions': {},
-            }
-
-            # pre-process text (lyrics) from given filename
+            # pre-process text (lyrics) from given filename and calculate word statistics and sentiment
             text, filtered_lyrics = self.default_preprocessor(filename, STOPWORDS_FILE)
-            words = filtered_lyrics.split()
-
-            # calculate word count
-            results['word_count'] = Counter(words)
-
-            # calculate total words
-            results['num_words'] = len(words)
-
-            # calculate average word length
-            total_characters = sum(len(word) for word in words)
-            results['avg_word_length'] = total_characters / len(words) if len(words) > 0 else 0
-
-            # calculate unique word count
-            results['unique_word_count'] = len(set(words))
-
-            # calculate type-token ratio (number of unique words / total number of words)
-            ttr = len(set(words)) / len(words) if len(words) > 0 else 0
-            results['type_token_ratio'] = ttr
-
-            # conduct sentiment analysis using TextBlob (used ChatGPT for TextBlob syntax)
-            blob = TextBlob(text)
-            results['polarity'] = blob.sentiment.polarity
-            results['subjectivity'] = blob.sentiment.subjectivity
-            if blob.sentiment.polarity > 0:
-                results['sentiment'] = 'Positive'
-            elif blob.sentiment.polarity < 0:
-                results['sentiment'] = 'Negative'
-            else:
-                results['sentiment'] = 'Neutral'
-
-            # conduct emotion analysis using pipeline (used ChatGPT for pipeline syntax)
-            classifier = pipeline('text-classification', model = 'j-hartmann/emotion-english-distilroberta-base',
-                                    device = 0)
-            emotions = classifier(text)
+            results = self._analyze_lyrics(text, filtered_lyrics)
+
+            # conduct emotion analysis using shared pipeline (used ChatGPT for pipeline syntax)
+            classifier = self._get_classifier()
+            emotions = classifier(text, truncation = True)
             results['emotions'] = {item['label']: item['score'] for item in emotions}
             return results
 
@@ -148,12 +187,56 @@ class Lyricool:
         # if no label provided, use provided filename
         if label is None:
             label = filename
+        self.add_results(label, results)
+
 
+    def add_results(self, label, results):
+        """ Store already-parsed results for a document (lyrics) under the given label (e.g. results produced by a
+        parser running in parallel). """
         # add lyrics results to self.data dictionary
         for k, v in results.items():
             self.data[k][label] = v
 
 
+    def load_texts(self, filenames, labels=None):
+        """ Register multiple documents (lyrics) with the framework using the default parser. Emotion analysis is run
+        on all texts together in batches, which is much faster than classifying each text separately. """
+        # if no labels provided, use provided filenames
+        if labels is None:
+            labels = filenames
+
+        # ensure there is exactly one label per file, so no document is silently dropped
+        if len(labels) != len(filenames):
+            raise LyricoolParsingError(f'Expected one label per file, but got {len(labels)} labels for '
+                                       f'{len(filenames)} files')
+
+        # pre-process each text (lyrics) and calculate word statistics and sentiment
+        texts = []
+        all_results = []
+        for filename in filenames:
+            try:
+                text, filtered_lyrics = self.default_preprocessor(filename, STOPWORDS_FILE)
+                texts.append(text)
+                all_results.append(self._analyze_lyrics(text, filtered_lyrics))
+            except LyricoolParsingError:
+                raise
+            except Exception as e:
+                raise LyricoolParsingError(f'An error occurred while parsing the file: {e}', filename)
+
+        # conduct emotion analysis on all texts at once using shared pipeline (pipeline batches texts internally)
+        try:
+            classifier = self._get_classifier()
+            all_emotions = classifier(texts, batch_size = 16, truncation = True)
+        except Exception as e:
+            raise LyricoolParsingError(f'An error occurred while classifying emotions: {e}')
+
+        # add emotions to each text's results and add lyrics results to self.data dictionary
+        for label, results, emotions in zip(labels, all_results, all_emotions):
+            emotions = emotions if isinstance(emotions, list) else [emotions]
+            results['emotions'] = {item['label']: item['score'] for item in emotions}
+            self.add_results(label, results)
+
+
     def wordcount_sankey(self, word_list=None, k=5, **kwargs):
         """ Map each text (lyrics) to words using a Sankey diagram, where the thickness of the line
         is the number of times that word occurs in the text. Users can specify a particular set of words,
@@ -165,50 +248,56 @@ class Lyricool:
             for word_counts in self.data['word_count'].values():
                 word_list.update(word for word, _ in word_counts.most_common(k))
 
-        # ensure no words provided in user-specified word_list are missing from all lyrics. if there are missing
-        # words, alert user in print statement.
-        missing_list = []
-        for word in word_list:
-            if not any(word in word_counts for word_counts in self.data['word_count'].values()):
-                missing_list.append(word)
+        # store word_list as a tuple so it can be iterated repeatedly in a fixed order
+        word_list = tuple(word_list)
+
+        # ensure no words provided in user-specified word_list are missing from all lyrics (check against union of
+        # words across all lyrics). if there are missing words, alert user in print statement.
+        all_words_seen = set().union(*(word_counts.keys() for word_counts in self.data['word_count'].values()))
+        is_missing = [word not in all_words_seen for word in word_list]
+        missing_list = [word for word, missing in zip(word_list, is_missing) if missing]
         if missing_list:
             print(f'The following word(s) are not present in any lyrics files: {', '.join(missing_list)}')
 
-        # create list to filter data in Sankey diagram format (source, target, value)
-        sankey_data = []
+        num_texts = len(self.data['word_count'])
+        num_words = len(word_list)
 
-        # create empty set to track which words are present in text (lyric) word counts
-        words_in_text = set()
+        # preallocate arrays for Sankey diagram format (source, target, value) with one row for each (text, word) pair
+        # plus one row for each word in case it is missing from all lyrics
+        size = (num_texts + 1) * num_words
+        sources = np.empty(size, dtype = object)
+        targets = np.empty(size, dtype = object)
+        values = np.zeros(size, dtype = np.int32)
 
-        # accumulate word counts across all given text labels for each word in word_list
+        # fill word counts across all given text labels for each word in word_list (default to 0 if word is not in
+        # current text label)
+        i = 0
         for text_label, word_counts in self.data['word_count'].items():
             for word in word_list:
-                # default to 0 if word is not in current text label
-                count = word_counts.get(word, 0)
-                if count > 0:
-                    sankey_data.append({'source': text_label, 'target': word, 'value': count})
-                    # track words that are actually found in lyrics
-                    words_in_text.add(word)
-
-        # add words that are in word_list but not in any lyrics
-        for word in word_list:
-            if word not in words_in_text:
-                # create separate source titled 'Missing words' to clearly show missing words not in any lyrics
-                sankey_data.append({'source': 'Missing words', 'target': word, 'value': 1})
-
-        # convert Sankey data to dataframe
-        sankey_df = pd.DataFrame(sankey_data)
+                sources[i] = text_label
+                targets[i] = word
+                values[i] = word_counts.get(word, 0)
+                i += 1
+
+        # add words that are in word_list but not in any lyrics. create separate source titled 'Missing words' to
+        # clearly show missing words not in any lyrics.
+        sources[i:] = 'Missing words'
+        targets[i:] = word_list
+        values[i:] = is_missing
+
+        # convert Sankey data to dataframe, keeping only rows where word occurs
+        present = values > 0
+        sankey_df = pd.DataFrame({'source': sources[present], 'target': targets[present], 'value': values[present]})
 
         # map labels in 'source' and 'target' to integer codes (used code from hw2)
         def code_mapping(df, src, targ):
-            # get distinct codes
-            labels = sorted(set(df[src].astype(str).tolist() + df[targ].astype(str).tolist()))
-            # create a label -> code mapping
-            label_map = {label: idx for idx, label in enumerate(labels)}
-            # substitute codes for labels in dataframe (will map src and targ separately in case of different data types)
-            df[src] = df[src].map(label_map)
-            df[targ] = df[targ].map(label_map)
-            return df, labels
+            # get distinct labels as categories of src and targ together
+            labels = pd.Categorical(pd.concat([df[src], df[targ]]).astype(str)).categories
+            # substitute category codes for labels in dataframe (will map src and targ separately in case of different
+            # data types)
+            df[src] = pd.Categorical(df[src].astype(str), categories = labels).codes
+            df[targ] = pd.Categorical(df[targ].astype(str), categories = labels).codes
+            return df, list(labels)
 
         df, labels = code_mapping(sankey_df, 'source', 'target')
 
@@ -249,34 +338,39 @@ class Lyricool:
             filtered_data = word_count_data
 
         # if all selected_labels are invalid, num_files will be 0 and no plots will be created. alert user if so.
+        if not filtered_data:
+            print('None of the given labels exist in the lyrics data. No plot will be generated.')
+            return
+
+        # skip texts (lyrics) with no words so they don't take up empty subplots. alert user if no texts are left.
+        filtered_data = {label: word_counts for label, word_counts in filtered_data.items() if word_counts}
         num_files = len(filtered_data)
         if num_files == 0:
-            print('None of the given labels exist in the lyrics data. No plot will be generated.')
+            print('None of the given labels have any words to plot. No plot will be generated.')
             return
 
-        # calculate grid dimensions based on user-input columns (default is 3) and adjust figure size by subplots
-        rows = ceil(num_files / cols)
-        fig, axes = plt.subplots(rows, cols, figsize = (cols * 6, rows * 5), constrained_layout = True)
+        # precompute (words, counts) for n_most_frequent words of each text (lyrics) in one pass (used ChatGPT to help
+        # zip common words)
+        top_words = [tuple(zip(*word_counts.most_common(n_most_frequent))) for word_counts in filtered_data.values()]
 
-        # flatten axes for easier indexing (used ChatGPT for syntax)
-        axes = axes.flatten()
+        # calculate grid dimensions based on user-input columns (default is 3) and adjust figure size by subplots.
+        # set subplot font sizes once through rcParams instead of per axes call.
+        rows = ceil(num_files / cols)
+        with plt.rc_context({'axes.labelsize': 9, 'axes.titlesize': 10, 'xtick.labelsize': 7, 'ytick.labelsize': 7}):
+            fig = plt.figure(figsize = (cols * 6, rows * 5), layout = 'constrained')
 
-        # generate a colormap (tab10) to pick unique colors for each subplot
-        subplot_colors = plt.cm.tab10(np.linspace(0, 1, num_files))
+            # flatten axes for easier indexing (used ChatGPT for syntax)
+            axes = fig.subplots(rows, cols, squeeze = False).flatten()
 
-        # plot each text's (lyrics') word counts for n_most_frequent words using subplot bar plots
-        for idx, (text_label, word_counts) in enumerate(filtered_data.items()):
-            most_common_words = word_counts.most_common(n_most_frequent)
-            # if no most_common_words, set (words, counts) to empty lists (used ChatGPT to help zip common words)
-            words, counts = zip(*most_common_words) if most_common_words else ([], [])
+            # generate a colormap (tab10) to pick unique colors for each subplot
+            subplot_colors = plt.cm.tab10(np.linspace(0, 1, num_files))
 
-            ax = axes[idx]
-            ax.bar(words, counts, color = subplot_colors[idx])
-            ax.set_xlabel('Word', fontsize = 9)
-            ax.set_ylabel('Frequency', fontsize = 9)
-            ax.tick_params(axis = 'x', labelsize = 7)
-            ax.tick_params(axis = 'y', labelsize = 7)
-            ax.set_title(f'Top {n_most_frequent} Words in {text_label}', fontsize = 10)
+            # plot each text's (lyrics') word counts for n_most_frequent words using subplot bar plots
+            for ax, text_label, (words, counts), color in zip(axes, filtered_data, top_words, subplot_colors):
+                ax.bar(words, counts, color = color)
+                ax.set_xlabel('Word')
+                ax.set_ylabel('Frequency')
+                ax.set_title(f'Top {n_most_frequent} Words in {text_label}')
 
         # remove extra axes based on extra space in figure
         for ax in axes[num_files:]:
@@ -285,6 +379,8 @@ class Lyricool:
         # add an overall title to figure
         fig.suptitle('Subplots of Most Frequent Words in Selected Songs', fontsize = 12)
 
+        return fig
+
 
     def polarity_subjectivity_scatterplot(self, lyric_data, selected_labels=None):
         """ Create a scatterplot comparing polarity vs. subjectivity of each text file (lyrics) in selected_labels. """
@@ -312,36 +408,35 @@ class Lyricool:
             print('No polarity/subjectivity data to plot.')
             return
 
-        # prepare data for scatter plot
-        polarities = []
-        subjectivities = []
+        # prepare data for scatter plot (float32 arrays allocated once at full size, plenty of precision for plotting)
         labels = list(filtered_data.keys())
-
-        for label, data in filtered_data.items():
-            polarity = data['polarity']
-            subjectivity = data['subjectivity']
-            polarities.append(polarity)
-            subjectivities.append(subjectivity)
+        num_texts = len(labels)
+        polarities = np.fromiter((data['polarity'] for data in filtered_data.values()), dtype = np.float32,
+                                 count = num_texts)
+        subjectivities = np.fromiter((data['subjectivity'] for data in filtered_data.values()), dtype = np.float32,
+                                     count = num_texts)
 
         # define unique colors for each text (lyrics) using colormap (tab20)
-        num_texts = len(filtered_data)
-        text_colors = plt.cm.get_cmap('tab20', num_texts)
+        text_colors = plt.cm.tab20(np.arange(num_texts) % 20)
 
         # create scatterplot
-        plt.figure(figsize = (10, 6))
-
-        # plot each text (lyrics set) using its respective color
-        for i, label in enumerate(labels):
-            plt.scatter(polarities[i], subjectivities[i], color = text_colors(i), label = label, s = 100,
-                        edgecolor = 'black')
-        plt.xlabel('Polarity')
-        plt.ylabel('Subjectivity')
+        fig, ax = plt.subplots(figsize = (10, 6), layout = 'constrained')
+
+        # plot all texts (lyrics sets) in a single scatter call using their respective colors, and build legend entries
+        # from proxy markers since a single scatter only has one label
+        ax.scatter(polarities, subjectivities, c = text_colors, s = 100, edgecolor = 'black')
+        legend_handles = [Line2D([0], [0], marker = 'o', color = 'w', markerfacecolor = color,
+                                 markeredgecolor = 'black', markersize = 10, label = label)
+                          for label, color in zip(labels, text_colors)]
+        ax.set_xlabel('Polarity')
+        ax.set_ylabel('Subjectivity')
         # strictly define x- and y-limits because they will always be the same for polarity and subjectivity
-        plt.xlim(-1, 1)
-        plt.ylim(0, 1)
-        plt.legend(title = 'Selected Songs', bbox_to_anchor = (1.05, 1), loc = 'upper left')
-        plt.title('Polarity vs. Subjectivity Across Selected Songs')
-        plt.tight_layout()
+        ax.set_xlim(-1, 1)
+        ax.set_ylim(0, 1)
+        ax.legend(handles = legend_handles, title = 'Selected Songs', bbox_to_anchor = (1.05, 1), loc = 'upper left')
+        ax.set_title('Polarity vs. Subjectivity Across Selected Songs')
+
+        return fig
 
 
 class LyricoolParsingError(Exception):
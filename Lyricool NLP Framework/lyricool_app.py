@@ -10,6 +10,8 @@ from lyricool import Lyricool, LyricoolParsingError
 import lyricool_parsers as lp
 import matplotlib.pyplot as plt
 import pprint as pp
+import gc
+from concurrent.futures import ThreadPoolExecutor
 
 
 def main():
@@ -17,27 +19,24 @@ def main():
     try:
         # load in lyrics data for desired songs (I chose to pull the first song of each Beatles album (up to 10) to
         # analyze change in style over time)
+        songs = [('https://www.azlyrics.com/lyrics/beatles/isawherstandingthere.html', "I Saw Her Standing There"),
+                 ('https://www.azlyrics.com/lyrics/beatles/itwontbelong.html', "It Won't Be Long"),
+                 ('https://www.azlyrics.com/lyrics/beatles/aharddaysnight.html', "A Hard Day's Night"),
+                 ('https://www.azlyrics.com/lyrics/beatles/noreply.html', "No Reply"),
+                 ('https://www.azlyrics.com/lyrics/beatles/help.html', "Help!"),
+                 ('https://www.azlyrics.com/lyrics/beatles/drivemycar.html', "Drive My Car"),
+                 ('https://www.azlyrics.com/lyrics/beatles/taxman.html', "Taxman"),
+                 ('https://www.azlyrics.com/lyrics/beatles/sgtpepperslonelyheartsclubband.html',
+                  "Sgt. Pepper's Lonely Hearts Club Band"),
+                 ('https://www.azlyrics.com/lyrics/beatles/backintheussr.html', "Back in the USSR"),
+                 ('https://www.azlyrics.com/lyrics/beatles/cometogether.html', "Come Together")]
+
+        # fetch and parse songs in parallel (parser limits concurrent requests), then store results in song order
         lyr = Lyricool()
-        lyr.load_text('https://www.azlyrics.com/lyrics/beatles/isawherstandingthere.html',
-                      "I Saw Her Standing There", parser = lp.az_lyrics_parser)
-        lyr.load_text('https://www.azlyrics.com/lyrics/beatles/itwontbelong.html', "It Won't Be Long",
-                       parser = lp.az_lyrics_parser)
-        lyr.load_text('https://www.azlyrics.com/lyrics/beatles/aharddaysnight.html', "A Hard Day's Night",
-                       parser = lp.az_lyrics_parser)
-        lyr.load_text('https://www.azlyrics.com/lyrics/beatles/noreply.html', "No Reply",
-                      parser = lp.az_lyrics_parser)
-        lyr.load_text('https://www.azlyrics.com/lyrics/beatles/help.html', "Help!",
-                      parser = lp.az_lyrics_parser)
-        lyr.load_text('https://www.azlyrics.com/lyrics/beatles/drivemycar.html', "Drive My Car",
-                       parser = lp.az_lyrics_parser)
-        lyr.load_text('https://www.azlyrics.com/lyrics/beatles/taxman.html', "Taxman",
-                      parser = lp.az_lyrics_parser)
-        lyr.load_text('https://www.azlyrics.com/lyrics/beatles/sgtpepperslonelyheartsclubband.html',
-                       "Sgt. Pepper's Lonely Hearts Club Band", parser = lp.az_lyrics_parser)
-        lyr.load_text('https://www.azlyrics.com/lyrics/beatles/backintheussr.html',"Back in the USSR",
-                      parser = lp.az_lyrics_parser)
-        lyr.load_text('https://www.azlyrics.com/lyrics/beatles/cometogether.html', "Come Together",
-                       parser = lp.az_lyrics_parser)
+        with ThreadPoolExecutor(max_workers = lp.MAX_CONCURRENT_FETCHES) as executor:
+            all_results = executor.map(lp.az_lyrics_parser, [url for url, _ in songs])
+            for (_, label), results in zip(songs, all_results):
+                lyr.add_results(label, results)
 
         # pretty-print lyrics data (optional)
         # pp.pprint(lyr.data)
@@ -45,10 +44,15 @@ def main():
         # generate three visualizations (need to call plt.show() in main function as opposed to individual functions
         # in order to generate each figure in its own window using TkAgg)
         lyr.wordcount_sankey()
-        lyr.most_frequent_words_subplots(lyr.data)
-        lyr.polarity_subjectivity_scatterplot(lyr.data)
+        figs = [lyr.most_frequent_words_subplots(lyr.data), lyr.polarity_subjectivity_scatterplot(lyr.data)]
         plt.show()
 
+        # close matplotlib figures once windows are closed so repeated runs don't keep them in memory
+        for fig in figs:
+            if fig is not None:
+                plt.close(fig)
+        gc.collect()
+
     # handle parsing-specific errors (used ChatGPT for error syntax)
     except LyricoolParsingError as e:
         print(f'Error: {e}')
@@ -9,32 +9,60 @@ unique_word_count, type_token_ratio, sentiment, polarity, subjectivity, and emot
 
 # import necessary packages
 import time
+import random
+import re
+import threading
 import requests
 import string
 import os
 os.environ['TOKENIZERS_PARALLELISM'] = 'false' # (used ChatGPT to help manage huggingface warning)
 from bs4 import BeautifulSoup
 from collections import Counter
+from functools import lru_cache
 from textblob import TextBlob
-from transformers import pipeline
 from lyricool import Lyricool, LyricoolParsingError, STOPWORDS_FILE
 
 
+class _LyricsCharTable(dict):
+    """ str.translate table that keeps lowercase letters, digits, and whitespace and deletes every other character.
+    Characters are classified the first time they are seen and cached in the dict after that. """
+    def __missing__(self, code):
+        char = chr(code)
+        self[code] = code if char in string.ascii_lowercase or char.isdigit() or char.isspace() else None
+        return self[code]
+
+
+# define global variables
+LYRICS_CHAR_TABLE = _LyricsCharTable()
+MAX_CONCURRENT_FETCHES = 4
+FETCH_SEMAPHORE = threading.Semaphore(MAX_CONCURRENT_FETCHES)  # bounds parallel requests to AZLyrics.com
+WHITESPACE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize = 4)
+def _stopwords_pattern(stopwords_file):
+    """ Compile one regex matching any whole stopword from stopwords file (built once per file). Longer stopwords are
+    tried first so a stopword that is a prefix of another doesn't cut it short. """
+    stopwords = sorted(Lyricool.load_stop_words(stopwords_file), key = len, reverse = True)
+    return re.compile(r'\b(?:' + '|'.join(map(re.escape, stopwords)) + r')\b') if stopwords else None
+
+
 def az_lyrics_preprocessor(url, stopwords_file=None):
     """ Pre-process lyrics from an AZLyrics URL for future parsing and visualization.
     Filter stopwords from stopwords file, if provided. """
     try:
-        # fetch URL content (used ChatGPT for requests syntax) using delay to avoid triggering anti-scraping restrictions
-        time.sleep(10)
-        response = requests.get(url)
+        # fetch URL content (used ChatGPT for requests syntax) using a short randomized delay and a bounded number of
+        # concurrent requests to avoid triggering anti-scraping restrictions
+        with FETCH_SEMAPHORE:
+            time.sleep(random.uniform(1, 3))
+            response = requests.get(url)
         response.raise_for_status()
 
-        # parse HTML content
-        soup = BeautifulSoup(response.text, 'html.parser')
+        # parse HTML content (using C-accelerated lxml parser)
+        soup = BeautifulSoup(response.text, 'lxml')
 
-        # use CSS Selectors for nested lyrics class (consistent for all AZLyrics.com pages) (used ChatGPT for CSS syntax)
-        selector = 'html > body.az-song-text > div.container.main-page > div.row > div.col-xs-12.col-lg-8.text-center'
-        lyric_directory = soup.select_one(selector)
+        # find nested lyrics class (consistent for all AZLyrics.com pages)
+        lyric_directory = soup.find('div', class_ = 'col-xs-12 col-lg-8 text-center')
         if not lyric_directory:
             # if HTML structure is different, alert user
             raise LyricoolParsingError('Lyrics section not found in HTML:', filename = url)
@@ -58,17 +86,14 @@ def az_lyrics_preprocessor(url, stopwords_file=None):
         raw_lyrics = '\n'.join(lyrics_lines)
 
         # clean lyrics (remove unnecessary whitespace, punctuation, and capitalization)
-        cleaned_lyrics = []
-        for char in raw_lyrics.lower():
-            if char in string.ascii_lowercase or char.isdigit() or char.isspace():
-                cleaned_lyrics.append(char)
-        clean_lyrics = ''.join(cleaned_lyrics)
-
-        # filter out stopwords
-        stopwords = set()
-        if stopwords_file:
-            stopwords = Lyricool.load_stop_words(stopwords_file = STOPWORDS_FILE)
-        filtered_lyrics = ' '.join(word for word in clean_lyrics.split() if word not in stopwords)
+        clean_lyrics = raw_lyrics.lower().translate(LYRICS_CHAR_TABLE)
+
+        # filter out stopwords in a single regex pass (pattern is only built once per stopwords file) and collapse
+        # leftover whitespace
+        stopwords_pattern = _stopwords_pattern(stopwords_file) if stopwords_file else None
+        if stopwords_pattern:
+            clean_lyrics = stopwords_pattern.sub('', clean_lyrics)
+        filtered_lyrics = WHITESPACE.sub(' ', clean_lyrics).strip()
         return filtered_lyrics
 
     # handle errors using exception class
@@ -115,10 +140,10 @@ def az_lyrics_parser(url):
         else:
             sentiment = 'Neutral'
 
-        # conduct emotion analysis using pipeline (used ChatGPT for pipeline syntax)
-        classifier = pipeline('text-classification', model = 'j-hartmann/emotion-english-distilroberta-base',
-                                device = 0)
-        emotions = classifier(filtered_lyrics)
+        # conduct emotion analysis using pipeline shared across all songs, so model is only loaded once (used ChatGPT
+        # for pipeline syntax)
+        classifier = Lyricool._get_classifier()
+        emotions = classifier(filtered_lyrics, truncation = True)
         emotion_dict = {item['label']: item['score'] for item in emotions}
 
         # return final output in format of default parser from lyricool.py
@@ -0,0 +1,36 @@
+"""
+file: quantize_emotion_model.py
+
+Description: One-off script to export the emotion classification model used by Lyricool to ONNX and quantize it to
+int8 for faster inference. Run once (requires optimum[onnxruntime]); Lyricool then loads the quantized model
+automatically.
+
+"""
+
+# import necessary packages
+from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+from optimum.onnxruntime.configuration import AutoQuantizationConfig
+from transformers import AutoTokenizer
+from lyricool import EMOTION_MODEL, QUANTIZED_EMOTION_MODEL_DIR
+
+
+# define global variables
+ONNX_MODEL_DIR = 'emo_onnx'
+
+
+def main():
+
+    # export original model to ONNX format and save its tokenizer alongside the quantized model
+    model = ORTModelForSequenceClassification.from_pretrained(EMOTION_MODEL, export = True)
+    model.save_pretrained(ONNX_MODEL_DIR)
+    AutoTokenizer.from_pretrained(EMOTION_MODEL).save_pretrained(QUANTIZED_EMOTION_MODEL_DIR)
+
+    # dynamically quantize ONNX model weights to int8 (uses VNNI dot-product instructions on supported CPUs)
+    quantizer = ORTQuantizer.from_pretrained(ONNX_MODEL_DIR)
+    quantization_config = AutoQuantizationConfig.avx512_vnni(is_static = False, per_channel = False)
+    quantizer.quantize(save_dir = QUANTIZED_EMOTION_MODEL_DIR, quantization_config = quantization_config)
+    print(f'Quantized emotion model saved to {QUANTIZED_EMOTION_MODEL_DIR}')
+
+
+if __name__ == '__main__':
+    main()
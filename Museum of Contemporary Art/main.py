@@ -15,6 +15,10 @@ def main():
     final_artist_df['BirthDecade'] = (final_artist_df['BeginDate'] // 10) * 10
     final_artist_df.drop(columns = ['BeginDate'], inplace = True)
 
+    # store nationality and gender as categorical columns so grouping uses integer codes instead of strings
+    final_artist_df['Nationality'] = final_artist_df['Nationality'].astype('category')
+    final_artist_df['Gender'] = final_artist_df['Gender'].astype('category')
+
     # Steps 2-5:
     # aggregate data by nationality and decade
     nationality_decade_agg = sk.aggregate_data(final_artist_df, 'Nationality', 'BirthDecade',
@@ -50,7 +54,6 @@ def main():
     # generate multi-layered sankey diagram using three layers: nationality, gender, and birth decade. use nationality
     # as the source, gender as the target, and birth decade as the additional cols parameter (used higher threshold for
     # visibility).
-    final_artist_df['Gender'].replace('male', 'Male', inplace = True)
     sk.make_sankey(final_artist_df, 'Nationality', 'Gender', 'BirthDecade', vals = 'ArtistCount',
                    count_threshold = 30)
 
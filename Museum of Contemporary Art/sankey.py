@@ -7,7 +7,6 @@ visualization
 '''
 
 import pandas as pd
-import numpy as np
 import plotly.graph_objects as go
 import warnings
 
@@ -23,10 +22,12 @@ def aggregate_data(df, col1, col2, val_col):
     Return this data as a dataframe.
     '''
     # for gender data, convert 'male' values to 'Male' for proper aggregation
-    if col1 or col2 == 'Gender':
-        df.replace('male', 'Male', inplace = True)
+    # (only replace within gender column, without modifying given df)
+    if 'Gender' in (col1, col2) and 'Gender' in df.columns:
+        df = df.assign(Gender = df['Gender'].replace({'male': 'Male'}))
 
-    agg_data = df.groupby([col1, col2]).size().reset_index(name = val_col)
+    # only keep observed category combinations (categorical columns would otherwise produce every pairing)
+    agg_data = df.groupby([col1, col2], observed = True).size().reset_index(name = val_col)
 
     return agg_data
 
@@ -40,8 +41,10 @@ def clean_data(df, count_threshold):
     if 'BirthDecade' in df.columns:
         df = df[df['BirthDecade'] != 0]
 
-    # for nationality data, replace rows with values 'Nationality unknown' or 'Nationality Unknown' with NaN values
-    df.replace(['Nationality unknown', 'Nationality Unknown'], np.nan, inplace = True)
+    # for nationality data, filter out rows with values 'Nationality unknown' or 'Nationality Unknown' using a single
+    # case-folded mask
+    if 'Nationality' in df.columns:
+        df = df[df['Nationality'].astype(str).str.lower().ne('nationality unknown')]
 
     df = df.dropna()
     df = df[df['ArtistCount'] >= count_threshold]
@@ -87,28 +90,31 @@ def make_sankey(df, src, targ, *cols, vals = None, count_threshold = 20, **kwarg
 
     # if cols are provided, go through stacking process
     if cols:
-        # create empty dataframe for stacking and assign first src and targ to be paired (given src and targ)
-        sankey_df = pd.DataFrame()
+        # collect each 'stack' in a list and assign first src and targ to be paired (given src and targ)
+        stacks = []
         current_src = src
         current_targ = targ
 
-        # create first 'stack' for given src and targ. add result to empty dataframe. rename columns 'src' and 'targ'
+        # create first 'stack' for given src and targ. add result to list of stacks. rename columns 'src' and 'targ'
         # for future mapping.
         initial_grouping = aggregate_data(df, current_src, current_targ, 'ArtistCount')
         initial_grouping = clean_data(initial_grouping, count_threshold)
         initial_grouping.rename(columns = {current_src: 'src', current_targ: 'targ'}, inplace = True)
-        sankey_df = pd.concat([sankey_df, initial_grouping], ignore_index = True)
+        stacks.append(initial_grouping)
 
         for col in cols:
             # create next 'stack' by pairing given targ and new column (col). rename columns to 'src' and 'targ'
-            # to match initial stack and add result to sankey_df, creating a stacked dataframe.
+            # to match initial stack and add result to list of stacks.
             col_grouping = aggregate_data(df, current_targ, col, 'ArtistCount')
             col_grouping = clean_data(col_grouping, count_threshold)
             col_grouping.rename(columns = {current_targ: 'src', col: 'targ'}, inplace = True)
-            sankey_df = pd.concat([sankey_df, col_grouping], ignore_index = True)
+            stacks.append(col_grouping)
 
             # shift columns so new source becomes old target and new target is next column in col
             current_targ = col
+
+        # combine all stacks into a single stacked dataframe with one concat
+        sankey_df = pd.concat(stacks, ignore_index = True)
     else:
         # keep sankey_df as given df if no cols are given. rename columns to 'src' and 'targ' for mapping.
         sankey_df = df.copy()
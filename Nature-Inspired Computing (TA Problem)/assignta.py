@@ -8,6 +8,7 @@ import numpy as np
 import random
 from profiler import profile, Profiler
 import csv
+from numba import njit, prange
 
 
 # define global variables
@@ -15,6 +16,177 @@ import csv
 TA_DATA = pd.read_csv('tas.csv')
 SECTION_DATA = pd.read_csv('sections.csv')
 
+# encode each section's lab time as an integer code (sections at the same time share a code)
+DAYTIME_CODES, DAYTIMES = pd.factorize(SECTION_DATA['daytime'])
+NUM_DAYTIMES = len(DAYTIMES)
+
+# precompute TA preference masks (True where TA prefers/is willing/is unwilling to support a section), int8 versions
+# of the unwilling and willing (but not preferred) masks for the objectives, and TA/section limits as numpy arrays once
+# instead of rebuilding them from pandas on every call
+PREFERENCES = TA_DATA.iloc[:, 3:].to_numpy()
+PREF_P = PREFERENCES == 'P'
+PREF_W = PREFERENCES == 'W'
+PREF_U = PREFERENCES == 'U'
+W_ONLY = PREF_W & ~PREF_P
+NOT_PREF = PREF_U | W_ONLY
+UNWILLING = PREF_U.astype(np.int8)
+WILLING_NOT_PREF = W_ONLY.astype(np.int8)
+
+# precompute which TAs have any preferred section, which sections are preferred by any TA, and each TA's first
+# preferred section (bool any reductions over fixed masks only need to run once)
+HAS_PREF_TA = PREF_P.any(axis = 1)
+HAS_PREF_SECTION = PREF_P.any(axis = 0)
+FIRST_PREF = PREF_P.argmax(axis = 1)
+
+# precompute each TA's reassignment target for unwilling assignments (first preferred section, otherwise first willing
+# section, or -1 if TA has neither)
+PREF_TARGET = np.where(HAS_PREF_TA, FIRST_PREF,
+                       np.where(PREF_W.any(axis = 1), PREF_W.argmax(axis = 1), -1))
+MAX_ASSIGNED = TA_DATA['max_assigned'].to_numpy().astype(np.int32)
+MIN_TA = SECTION_DATA['min_ta'].to_numpy().astype(np.int32)
+
+# create one numpy random generator for the agents (faster than the legacy np.random samplers)
+RNG = np.random.default_rng()
+
+
+# define compiled objective kernels (plain loops over ndarrays so numba can compile them, no temporary arrays)
+
+@njit(cache = True)
+def _overallocation(solution, max_assigned):
+    """ Sum overallocation penalties (labs assigned - max_assigned, if positive) over all TAs. """
+    penalty = 0
+    for ta in range(solution.shape[0]):
+        assigned = 0
+        for section in range(solution.shape[1]):
+            assigned += solution[ta, section]
+        if assigned > max_assigned[ta]:
+            penalty += assigned - max_assigned[ta]
+    return penalty
+
+@njit(cache = True)
+def _conflicts(solution, time_codes, num_times):
+    """ Count TAs assigned to more than one lab at the same time. """
+    conflicts = 0
+    seen = np.zeros(num_times, dtype = np.int8)
+    for ta in range(solution.shape[0]):
+        seen[:] = 0
+        for section in range(solution.shape[1]):
+            if solution[ta, section]:
+                if seen[time_codes[section]]:
+                    conflicts += 1
+                    break
+                seen[time_codes[section]] = 1
+    return conflicts
+
+@njit(cache = True)
+def _undersupport(solution, min_ta):
+    """ Sum undersupport penalties (min_ta - assigned TAs, if positive) over all sections. """
+    penalty = 0
+    for section in range(solution.shape[1]):
+        assigned = 0
+        for ta in range(solution.shape[0]):
+            assigned += solution[ta, section]
+        if assigned < min_ta[section]:
+            penalty += min_ta[section] - assigned
+    return penalty
+
+@njit(cache = True)
+def _masked_count(solution, mask):
+    """ Count assignments where mask is set (fused multiply and sum of solution and mask). """
+    count = 0
+    for ta in range(solution.shape[0]):
+        for section in range(solution.shape[1]):
+            count += solution[ta, section] * mask[ta, section]
+    return count
+
+@njit(cache = True)
+def _evaluate(solution, max_assigned, min_ta, time_codes, num_times, unwilling, willing_not_pref, scores):
+    """ Score one solution on all five objectives in a single pass over its assignments, sharing the TA and section
+    counts between objectives. Writes scores (in objective function order) into scores. """
+    tas_per_section = np.zeros(solution.shape[1], dtype = np.int64)
+    seen = np.zeros(num_times, dtype = np.int8)
+    overallocation = conflicts = unwilling_count = unpreferred_count = 0
+    for ta in range(solution.shape[0]):
+        seen[:] = 0
+        assigned = 0
+        has_conflict = False
+        for section in range(solution.shape[1]):
+            if solution[ta, section]:
+                assigned += 1
+                tas_per_section[section] += 1
+                unwilling_count += unwilling[ta, section]
+                unpreferred_count += willing_not_pref[ta, section]
+                if seen[time_codes[section]]:
+                    has_conflict = True
+                seen[time_codes[section]] = 1
+        if assigned > max_assigned[ta]:
+            overallocation += assigned - max_assigned[ta]
+        if has_conflict:
+            conflicts += 1
+
+    undersupport = 0
+    for section in range(solution.shape[1]):
+        if tas_per_section[section] < min_ta[section]:
+            undersupport += min_ta[section] - tas_per_section[section]
+
+    scores[0] = overallocation
+    scores[1] = conflicts
+    scores[2] = undersupport
+    scores[3] = unwilling_count
+    scores[4] = unpreferred_count
+
+@njit(parallel = True, cache = True)
+def eval_batch(population, max_assigned, min_ta, time_codes, num_times, unwilling, willing_not_pref):
+    """ Score every solution in a (solutions, TAs, sections) population on all five objectives in parallel. """
+    scores = np.empty((population.shape[0], 5), dtype = np.int64)
+    for k in prange(population.shape[0]):
+        _evaluate(population[k], max_assigned, min_ta, time_codes, num_times, unwilling, willing_not_pref, scores[k])
+    return scores
+
+
+# define compiled agent kernels
+
+@njit(cache = True)
+def _rebalance(solution, tas_per_section, min_ta, underallocated, preferred, available_tas, is_overallocated_ta):
+    """ Move each available TA from their first assigned section to an underallocated section (their first preferred
+    one if possible), removing sections from underallocated once they reach min_ta. Updates arrays in place. """
+    num_underallocated = len(underallocated)
+    for ta in available_tas:
+        if is_overallocated_ta[ta] or num_underallocated == 0:
+            # skip TAs that are overallocated or if there are no underallocated times
+            continue
+
+        # if preferred underallocated sections exist, choose first one. otherwise use first underallocated section.
+        target_section = underallocated[0]
+        for i in range(num_underallocated):
+            if preferred[ta, underallocated[i]]:
+                target_section = underallocated[i]
+                break
+
+        # find first section TA is currently assigned to (-1 if unassigned)
+        assigned_section = -1
+        for section in range(solution.shape[1]):
+            if solution[ta, section] == 1:
+                assigned_section = section
+                break
+
+        if assigned_section >= 0:
+            # reassign and update counts
+            solution[ta, assigned_section] = 0
+            tas_per_section[assigned_section] -= 1
+            solution[ta, target_section] = 1
+            tas_per_section[target_section] += 1
+
+            # if underallocated section is now balanced, remove it from underallocated list (shifting later
+            # entries down to keep their order, which decides the target section of TAs without a preferred one)
+            if tas_per_section[target_section] == min_ta[target_section]:
+                for i in range(num_underallocated):
+                    if underallocated[i] == target_section:
+                        for j in range(i, num_underallocated - 1):
+                            underallocated[j] = underallocated[j + 1]
+                        num_underallocated -= 1
+                        break
+
 
 # define objective functions
 
@@ -24,20 +196,15 @@ def minimize_overallocation(solution):
     penalties over all TAs. """
     # count labs assigned to each TA and calculate overallocation penalty (labs assigned - max_assigned) for each.
     # if penalty is negative, set equal to 0 (no penalty). sum penalties to get total penalty.
-    return np.sum(np.maximum(solution.sum(axis = 1) - TA_DATA['max_assigned'].values, 0))
+    return int(_overallocation(solution, MAX_ASSIGNED))
 
 @profile
 def minimize_conflicts(solution):
     """ Second objective function: Calculate the total number of TA time conflicts to minimize the number
     of TAs with one or more time conflicts. """
-    # get assigned lab times for all TAs as well as each TA's id/row
-    assigned_times = SECTION_DATA.loc[np.where(solution == 1)[1], 'daytime'].values
-    ta_ids = np.where(solution == 1)[0]
-
-    # use pandas to count conflicts by grouping by TA and checking for duplicate times (multiple conflicts count as 1
-    # conflict --> use .any). sum TA conflicts to get total conflicts. (used ChatGPT for order of panda functions)
-    return (pd.DataFrame({'TA_ID': ta_ids, 'Assigned_Time': assigned_times}).duplicated(['TA_ID', 'Assigned_Time'])
-            .groupby(ta_ids).any().sum())
+    # check each TA's assigned lab time codes for a repeat. TAs with any repeated time have a conflict (multiple
+    # conflicts count as 1 conflict). sum TA conflicts to get total conflicts.
+    return int(_conflicts(solution, DAYTIME_CODES, NUM_DAYTIMES))
 
 @profile
 def minimize_undersupport(solution):
@@ -45,23 +212,43 @@ def minimize_undersupport(solution):
     the total penalty score across all sections. """
     # count number of TAs per section and calculate undersupport for each section (min_tas - assigned TAs). if penalty
     # is negative, set equal to 0 (no penalty). sum section penalties to get total penalty.
-    return np.maximum(SECTION_DATA['min_ta'].values - solution.sum(axis = 0), 0).sum()
+    return int(_undersupport(solution, MIN_TA))
 
 @profile
 def minimize_unwilling(solution):
     """ Fourth objective function: Calculate the total number of times TAs are assigned to a section they are unwilling
     to support to minimize total unwilling instances across all sections. """
-    # convert 'U' (unwilling) values to 1 and all other values to 0 (willing or preferred) for all TA rows. multiply
-    # solution by unwilling values to compute number of unwilling assignments in result. sum for total instances.
-    return np.sum(solution * (TA_DATA.iloc[:, 3:] == 'U').astype(int).values)
+    # multiply solution by precomputed unwilling mask ('U' values are 1, willing or preferred are 0) and sum in one
+    # fused pass to count total unwilling assignments
+    return int(_masked_count(solution, UNWILLING))
 
 @profile
 def minimize_unpreferred(solution):
     """ Fifth objective function: Calculate the total number of times TAs are assigned to a section they are willing
     (but not preferred) to support to minimize total unpreferred instances across all sections. """
-    # extract willingness and preference from TA_DATA for all TA rows. sum total unpreferred assignments for each TA to
-    # get total unpreferred assignments.
-    return np.sum(solution * ((TA_DATA.iloc[:, 3:] == 'W') & (TA_DATA.iloc[:, 3:] != 'P')).values)
+    # multiply solution by precomputed willing (but not preferred) mask and sum in one fused pass to count total
+    # unpreferred assignments
+    return int(_masked_count(solution, WILLING_NOT_PREF))
+
+@profile
+def evaluate_solution(solution):
+    """ Combined objective function: Score one solution on all five objectives at once (same order as the objective
+    functions above). """
+    # compute all five scores in one compiled pass instead of five separate passes over solution
+    scores = np.empty(5, dtype = np.int64)
+    _evaluate(solution, MAX_ASSIGNED, MIN_TA, DAYTIME_CODES, NUM_DAYTIMES, UNWILLING, WILLING_NOT_PREF, scores)
+    return scores.tolist()
+
+@profile
+def evaluate_solutions(solutions):
+    """ Batch objective function: Score a list of solutions (or a (solutions, TAs, sections) array, or one solution) on
+    all five objectives at once (columns in the same order as the objective functions above). """
+    # stack solutions into one C-contiguous 3D int8 array (each solution's TA rows laid out back to back, matching the
+    # kernels' loop order) and score them across cores with the cached module-level arrays
+    population = np.ascontiguousarray(solutions, dtype = np.int8)
+    if population.ndim == 2:
+        population = population[np.newaxis]
+    return eval_batch(population, MAX_ASSIGNED, MIN_TA, DAYTIME_CODES, NUM_DAYTIMES, UNWILLING, WILLING_NOT_PREF)
 
 
 # define agents
@@ -69,48 +256,31 @@ def minimize_unpreferred(solution):
 @profile
 def overallocation_minimizer(solutions):
     """ Agent to minimize total overallocation penalty. """
-    # load max_assigned and TA preferences values
-    max_support = TA_DATA['max_assigned'].values
-
-    # choose a random solution from solutions
-    solution = random.choice(solutions).copy()
+    # choose a random solution from solutions (copied as C-contiguous int8)
+    solution = random.choice(solutions).astype(np.int8, order = 'C')
 
     # calculate number of sections each TA is assigned to and number of TAs for each section
-    sections_per_ta = np.sum(solution, axis = 1)
-    tas_per_section = np.sum(solution, axis = 0)
+    sections_per_ta = solution.sum(axis = 1, dtype = np.int32)
+    tas_per_section = solution.sum(axis = 0, dtype = np.int32)
 
     # identify overallocated TAs (assigned to more sections than their max)
-    overallocated_tas = np.where(sections_per_ta > max_support)[0]
-
-    # get preferences data
-    unwilling_data = TA_DATA.iloc[:, 3:] == 'U'
-    willing_data = TA_DATA.iloc[:, 3:] == 'W'
+    overallocated_tas = np.where(sections_per_ta > MAX_ASSIGNED)[0]
 
     for ta in overallocated_tas:
-        # get sections TA is assigned to and remove them from a section if they are unwilling
-        unwilling_sections = np.where(solution[ta, :] == 1)[0]
-        for section in unwilling_sections:
-            if unwilling_data.iloc[ta, section]:
-                solution[ta, section] = 0
-                sections_per_ta[ta] -= 1
-                tas_per_section[section] -= 1
-
-        # get sections TA is assigned to and remove them from a section if they are willing but not preferred
-        willing_sections = np.where(solution[ta, :] == 1)[0]
-        for section in willing_sections:
-            if willing_data.iloc[ta, section] and not unwilling_data.iloc[ta, section]:
-                solution[ta, section] = 0
-                sections_per_ta[ta] -= 1
-                tas_per_section[section] -= 1
-
-        # keep removing TA from sections as long as they are overallocated
-        while sections_per_ta[ta] > max_support[ta]:
-            # find section with maximum TAs where this TA is assigned and remove TA
-            assigned_sections = np.where(solution[ta, :] == 1)[0]
-            section_to_remove = assigned_sections[np.argmax(tas_per_section[assigned_sections])]
-            solution[ta, section_to_remove] = 0
-            sections_per_ta[ta] -= 1
-            tas_per_section[section_to_remove] -= 1
+        # remove TA from all sections they are unwilling or willing (but not preferred) to support in one vectorized
+        # write and update TAs per section
+        dropped = solution[ta] & NOT_PREF[ta]
+        solution[ta] -= dropped
+        tas_per_section -= dropped
+
+        # remove TA from the num_excess assigned sections with the most TAs in one shot (unassigned sections score -1
+        # so they are never picked). stable sort breaks ties by earliest section, like removing one at a time would.
+        num_excess = sections_per_ta[ta] - dropped.sum() - MAX_ASSIGNED[ta]
+        if num_excess > 0:
+            section_scores = np.where(solution[ta] == 1, tas_per_section, -1)
+            sections_to_remove = np.argsort(-section_scores, kind = 'stable')[:num_excess]
+            solution[ta, sections_to_remove] = 0
+            tas_per_section[sections_to_remove] -= 1
 
     return solution
 
@@ -120,145 +290,90 @@ def conflicts_minimizer(solutions):
     # choose a random solution from solutions
     solution = random.choice(solutions).copy()
 
-    # get assigned labs and their TAs
-    ta_indices, lab_indices = np.where(solution == 1)
-    assigned_times = SECTION_DATA.loc[lab_indices, 'daytime'].values
+    # get assigned labs, their TAs, and lab time codes, and sort assignments by (TA, time) (stable, so each TA's
+    # first lab at a time stays first)
+    ta_indices, lab_indices = np.nonzero(solution)
+    codes = DAYTIME_CODES[lab_indices]
+    order = np.lexsort((codes, ta_indices))
+    ta_sorted = ta_indices[order]
+    codes_sorted = codes[order]
 
-    # create pandas dataframe to identify duplicates by TA and their assigned times (used ChatGPT for .duplicated syntax)
-    is_conflicting = pd.Series(assigned_times).duplicated(keep = 'first').values
+    # identify duplicate (TA, time) pairs as sorted assignments matching the one before them
+    is_conflicting = np.zeros(len(order), dtype = bool)
+    is_conflicting[1:] = (ta_sorted[1:] == ta_sorted[:-1]) & (codes_sorted[1:] == codes_sorted[:-1])
 
     # unassign TAs from extra (duplicate) lab times while keeping one at that time
-    solution[ta_indices[is_conflicting], lab_indices[is_conflicting]] = 0
+    solution[ta_sorted[is_conflicting], lab_indices[order[is_conflicting]]] = 0
 
     return solution
 
 @profile
 def undersupport_minimizer(solutions):
     """ Agent to minimize total undersupport penalty. """
-    # load min_ta and max_assigned values
-    min_tas = SECTION_DATA['min_ta'].values
-    max_support = TA_DATA['max_assigned'].values
-
-    # choose a random solution from solutions
-    solution = random.choice(solutions).copy()
+    # choose a random solution from solutions (copied as C-contiguous int8)
+    solution = random.choice(solutions).astype(np.int8, order = 'C')
 
     # calculate number of sections each TA is assigned to and number of TAs per section
-    sections_per_ta = np.sum(solution, axis = 1)
-    tas_per_section = np.sum(solution, axis = 0)
+    sections_per_ta = solution.sum(axis = 1, dtype = np.int32)
+    tas_per_section = solution.sum(axis = 0, dtype = np.int32)
 
     # create list of overallocated sections (more than min_tas) and underallocated sections (fewer than min_tas)
-    overallocated = np.where(tas_per_section > min_tas)[0]
-    underallocated = np.where(tas_per_section < min_tas)[0]
+    overallocated = np.where(tas_per_section > MIN_TA)[0]
+    underallocated = np.where(tas_per_section < MIN_TA)[0]
 
     # identify overallocated TAs (assigned to more sections than their max)
-    overallocated_tas = np.where(sections_per_ta > max_support)[0]
+    is_overallocated_ta = sections_per_ta > MAX_ASSIGNED
 
     # create list of all TAs that are available for movement (note: unassigned TAs, TAs in overallocated sections, or
-    # TAs in unwilling sections are free to move)
-    unwilling_data = TA_DATA.iloc[:, 3:] == 'U'
-    available_tas = np.unique(np.concatenate([np.where(sections_per_ta == 0)[0],
-                                              np.where((solution == 1) & unwilling_data.values)[0],
-                                              np.where(np.sum(solution[:, overallocated], axis = 1) > 0)[0]]))
-
-    # get preferred sections
-    preferred_data = TA_DATA.iloc[:, 3:] == 'P'
+    # TAs in unwilling sections are free to move). combine conditions into one TA mask and take its (sorted) indices.
+    is_available_ta = (sections_per_ta == 0) | ((solution == 1) & PREF_U).any(axis = 1)
+    # only gather overallocated section columns if there are any (skips an empty fancy-index copy)
+    if overallocated.size:
+        is_available_ta |= solution[:, overallocated].any(axis = 1)
+    available_tas = np.flatnonzero(is_available_ta)
 
-    # move TAs from underallocated sections as needed
-    for ta in available_tas:
-        if ta in overallocated_tas or len(underallocated) == 0:
-             # skip TAs that are overallocated or if there are no underallocated times
-            continue
-
-        # if preferred underallocated sections exist, choose one. otherwise use any underallocated section.
-        preferred_underallocated_sections = underallocated[np.isin(underallocated, np.where(preferred_data.iloc[ta])[0])]
-        target_section = (preferred_underallocated_sections[0] if len(preferred_underallocated_sections) > 0
-                          else underallocated[0])
-
-        # check if TA is currently assigned to any section
-        assigned_sections = np.where(solution[ta] == 1)[0]
-        if assigned_sections.size > 0:
-            # reassign and update counts
-            assigned_section = assigned_sections[0]
-            solution[ta, assigned_section] = 0
-            tas_per_section[assigned_section] -= 1
-
-            # if overallocated section is now balanced, remove it from overallocated list
-            if tas_per_section[assigned_section] == min_tas[assigned_section]:
-                overallocated = overallocated[overallocated != assigned_section]
-
-            # update target underallocated section counts
-            solution[ta, target_section] = 1
-            tas_per_section[target_section] += 1
-
-            # if underallocated section is now balanced, remove it from underallocated list
-            if tas_per_section[target_section] == min_tas[target_section]:
-                underallocated = underallocated[underallocated != target_section]
+    # move TAs from underallocated sections as needed (compiled loop updates solution and counts in place)
+    _rebalance(solution, tas_per_section, MIN_TA, underallocated, PREF_P, available_tas, is_overallocated_ta)
 
     return solution
 
 @profile
 def unwilling_minimizer(solutions):
     """ Agent to minimize total unwilling instances across all sections. """
-    # load TA preferences
-    ta_preferences = TA_DATA.iloc[:, 3:].to_numpy()
-    willing_sections = (ta_preferences == 'W')
-    preferred_sections = (ta_preferences == 'P')
-
     # choose a random solution from solutions
     solution = random.choice(solutions).copy()
 
-    # identify TAs assigned to unwilling sections
-    ta_indices, section_indices = np.where(solution == 1)
-    unwilling_assignments = (ta_preferences[ta_indices, section_indices] == 'U')
-
-    # find indices of unwilling assignments and reassign TAs
-    for idx in np.where(unwilling_assignments)[0]:
-        ta = ta_indices[idx]
-        section = section_indices[idx]
-
-        # try to find a preferred section first (P) otherwise use willing section (W). use first P/W section.
-        preferred_section_indices = np.where(preferred_sections[ta])[0]
-        willing_section_indices = np.where(willing_sections[ta])[0]
+    # identify TAs assigned to any unwilling section that have a preferred/willing section to move to
+    rows = np.flatnonzero(((solution == 1) & PREF_U).any(axis = 1) & (PREF_TARGET >= 0))
 
-        target_section = (preferred_section_indices[0] if preferred_section_indices.size > 0
-                          else willing_section_indices[0] if willing_section_indices.size > 0 else None)
-
-        if target_section is not None:
-            # update solution (unassign from unwilling section, reassign to new section)
-            solution[ta, section] = 0
-            solution[ta, target_section] = 1
+    # update solution for all these TAs at once (unassign from unwilling sections, reassign to target section)
+    solution[rows] &= ~PREF_U[rows]
+    solution[rows, PREF_TARGET[rows]] = 1
 
     return solution
 
 @profile
 def unpreferred_minimizer(solutions):
     """ Agent to minimize total unpreferred instances across all sections. """
-    # load min_ta and TA preferences data
-    min_tas = SECTION_DATA['min_ta'].values
-    ta_preferences = TA_DATA.iloc[:, 3:].to_numpy()
-    willing_sections = (ta_preferences == 'W')
-    preferred_sections = (ta_preferences == 'P')
-
     # choose a random solution from solutions
     solution = random.choice(solutions).copy()
 
     # calculate number of TAs assigned to each section and identify unpreferred assignments
-    tas_per_section = np.sum(solution, axis = 0)
-    ta_indices, section_indices = np.where(solution == 1)
-    unpreferred_indices = np.where(willing_sections[ta_indices, section_indices] &
-                                ~preferred_sections[ta_indices, section_indices])[0]
+    tas_per_section = solution.sum(axis = 0, dtype = np.int32)
+    ta_indices, section_indices = np.nonzero((solution == 1) & W_ONLY)
 
     # identify undersupported preferred sections
-    undersupported_preferred_sections = np.where((tas_per_section < min_tas) & preferred_sections.any(axis = 0))[0]
+    undersupported_preferred_sections = np.where((tas_per_section < MIN_TA) & HAS_PREF_SECTION)[0]
 
     # reallocate unpreferred assignments
-    for idx in unpreferred_indices:
-        ta, section = ta_indices[idx], section_indices[idx]
-
-        # move TA to first undersupported preferred section. if none, move to any preferred section.
-        preferred_ta_sections = np.where(preferred_sections[ta])[0]
-        target_section = (undersupported_preferred_sections[0] if undersupported_preferred_sections.size > 0
-                          else preferred_ta_sections[0] if preferred_ta_sections.size > 0 else None)
+    for ta, section in zip(ta_indices, section_indices):
+        # move TA to first undersupported preferred section. if none, move to first preferred section of TA.
+        if undersupported_preferred_sections.size > 0:
+            target_section = undersupported_preferred_sections[0]
+        elif HAS_PREF_TA[ta]:
+            target_section = int(FIRST_PREF[ta])
+        else:
+            target_section = None
 
         if target_section is not None:
             solution[ta, section] = 0
@@ -281,15 +396,15 @@ def shuffle_solutions(solutions):
     # calculate number of assignments to shuffle
     num_to_shuffle = int(num_tas * num_sections * shuffle_ratio)
 
-    # randomly select indices to shuffle
-    shuffle_indices = np.random.choice(num_tas * num_sections, num_to_shuffle, replace = False)
+    # randomly select indices to shuffle (order of indices doesn't matter, so skip generator's final shuffle)
+    shuffle_indices = RNG.choice(num_tas * num_sections, num_to_shuffle, replace = False, shuffle = False)
 
-    # shuffle values (0 -> 1, 1 -> 0) for selected indices (used ChatGPT to help speed up operation using .flatten)
-    solution_flat = solution.flatten()
-    solution_flat[shuffle_indices] = 1 - solution_flat[shuffle_indices]
+    # shuffle values (0 -> 1, 1 -> 0) for selected indices in place through a flat view of copied solution (no reshape
+    # needed since view shares solution's memory)
+    solution_flat = solution.ravel()
+    solution_flat[shuffle_indices] ^= 1
 
-    # reshape back to original 2D form (used ChatGPT for .reshape as part of .flatten)
-    return solution_flat.reshape(num_tas, num_sections)
+    return solution
 
 @profile
 def mutate_solutions(solutions):
@@ -299,10 +414,10 @@ def mutate_solutions(solutions):
 
     # set mutation rate and create mutation mask (True for mutation, False for no mutation) (used ChatGPT for syntax)
     mutation_rate = random.uniform(0.1, 0.3)
-    mutation_mask = np.random.rand(*solution.shape) < mutation_rate
+    mutation_mask = RNG.random(solution.shape) < mutation_rate
 
-    # flip values in solution where mutation_mask is True (values to be mutated)
-    solution[mutation_mask] = 1 - solution[mutation_mask]
+    # flip values in solution where mutation_mask is True (values to be mutated) with one whole-array XOR
+    solution ^= mutation_mask.astype(solution.dtype)
 
     return solution
 
@@ -312,19 +427,14 @@ def mutate_solutions(solutions):
 def write_scores_csv(final_population, groupname, filename='nondominated_solution_scores.csv'):
     """ Write csv file containing summary table of objective scores for all non-dominated Pareto-optimal solutions.
      (used ChatGPT for csv-writing procedure) """
-    # define list of expected objectives for csv header
-    expected_objectives = ['overallocation', 'conflicts', 'undersupport', 'unwilling', 'unpreferred']
-
     with open(filename, mode = 'w', newline = '') as file:
         writer = csv.writer(file)
-        # write header
-        writer.writerow(['groupname'] + expected_objectives)
+        # write header (objectives in the order they were registered, which is also the order of each eval's scores)
+        writer.writerow(['groupname'] + final_population.fitness_names)
 
         # iterate over each non-dominated solution and write row with its objective scores
-        for eval, sol in final_population.pop.items():
-            # convert eval to dictionary and extract scores in the expected order
-            eval_dict = dict(eval)
-            writer.writerow([groupname] + [eval_dict.get(obj, None) for obj in expected_objectives])
+        for eval in final_population.pop.keys():
+            writer.writerow([groupname] + list(eval))
 
 
 # find non-dominated solutions using optimizer
@@ -340,6 +450,8 @@ def main():
     E.add_fitness_criteria('undersupport', minimize_undersupport)
     E.add_fitness_criteria('unwilling', minimize_unwilling)
     E.add_fitness_criteria('unpreferred', minimize_unpreferred)
+    E.add_combined_fitness(evaluate_solution)
+    E.add_batch_fitness(evaluate_solutions)
 
     # register agents with Evo
     E.add_agent('overallocation_minimizer', overallocation_minimizer, k=1)
@@ -351,12 +463,14 @@ def main():
     E.add_agent('mutate_solutions', mutate_solutions, k=1)
 
     # create an initial solution, S
-    S = np.random.randint(2, size = (43, 17))
+    S = np.random.randint(2, size = (43, 17), dtype = np.int8)
     E.add_solution(S)
 
     # run optimizer for five minutes (300 seconds) and print profiling report. also print initial and final populations.
+    # status is counted in batches, so scale it to print status every 10,000 agent calls.
+    batch_size = 32
     print('Initial population:\n', E)
-    E.evolve(dom=100, status=10000, time_limit=300)
+    E.evolve_batch(dom=100, status=10_000 // batch_size, time_limit=300, batch_size=batch_size)
     print('Final population:\n', E)
     Profiler.report()
 
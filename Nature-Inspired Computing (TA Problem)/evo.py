@@ -4,23 +4,41 @@ evo.py: An evolutionary computing framework
 
 import random as rnd
 import copy
-from functools import reduce
 import numpy as np
 import time # added to track run time
 from profiler import profile # added to profile optimizer (evolve function)
 
 
+# how many iterations to run between time limit checks (reading clock every iteration adds up for fast agents)
+TIME_CHECK_INTERVAL = 256
+
+
 class Evo:
 
     def __init__(self):
-        self.pop = {}   # evaluation --> solution
+        self.pop = {}   # evaluation (tuple of scores) --> solution
         self.fitness = {} # name --> objective function
+        self.fitness_names = [] # objective names, in the same order as the scores in each evaluation
+        self.combined_fitness = None # optional function scoring one solution on all objectives at once
+        self.batch_fitness = None # optional function scoring many solutions at once
         self.agents = {} # name --> (operator function, num_solutions_input)
 
     def add_fitness_criteria(self, name, f):
         """ Register an objective with the environment """
+        if name not in self.fitness:
+            self.fitness_names.append(name)
         self.fitness[name] = f
 
+    def add_combined_fitness(self, f):
+        """ Register a function that scores one solution on every objective in one call (so objectives can share work).
+        It must return the scores in the same order the objectives were registered. """
+        self.combined_fitness = f
+
+    def add_batch_fitness(self, f):
+        """ Register a function that scores a list of solutions in one call. It must return one row of scores per
+        solution, with columns in the same order the objectives were registered. """
+        self.batch_fitness = f
+
     def add_agent(self, name, op, k=1):
         """ Register an agent with the environment
         The operator (op) defines how the agent tweaks a solution.
@@ -29,8 +47,21 @@ class Evo:
 
     def add_solution(self, sol):
         """ Add a solution to the population """
-        eval = tuple([(name, f(sol)) for name, f in self.fitness.items()])
-        self.pop[eval] = sol # ((name1, objval1), (name2, objval2)...) ===> solution
+        if self.combined_fitness is None:
+            eval = tuple([f(sol) for f in self.fitness.values()])
+        else:
+            eval = tuple(self.combined_fitness(sol))
+        self.pop[eval] = sol # (objval1, objval2, ...) ===> solution
+
+    def add_solutions(self, sols):
+        """ Add several solutions to the population, scoring them together if a batch fitness function is set """
+        if self.batch_fitness is None:
+            for sol in sols:
+                self.add_solution(sol)
+            return
+
+        for sol, scores in zip(sols, self.batch_fitness(sols).tolist()):
+            self.pop[tuple(scores)] = sol
 
     def get_random_solutions(self, k=1):
         """ Pick k random solutions from the population"""
@@ -38,8 +69,10 @@ class Evo:
             return []
         else:
             solutions = tuple(self.pop.values())
-            # Doing a deep copy of a randomly chosen solution (k times)
-            return [copy.deepcopy(rnd.choice(solutions)) for _ in range(k)]
+            # Copying a randomly chosen solution (k times). numpy solutions use the much faster ndarray.copy, anything
+            # else falls back to a deep copy.
+            picks = [rnd.choice(solutions) for _ in range(k)]
+            return [sol.copy() if isinstance(sol, np.ndarray) else copy.deepcopy(sol) for sol in picks]
 
     def run_agent(self, name):
         """ Invoke a named agent on the population """
@@ -48,44 +81,73 @@ class Evo:
         new_solution = op(picks)
         self.add_solution(new_solution)
 
+    def run_agents(self, names):
+        """ Invoke several named agents on the current population and add their solutions together """
+        new_solutions = []
+        for name in names:
+            op, k = self.agents[name]
+            new_solutions.append(op(self.get_random_solutions(k)))
+        self.add_solutions(new_solutions)
+
     def dominates(self, p, q):
         """
-        p = evaluation of one solution: ((obj1, score 1), (obj2, score2), ...)
-        q = evaluation of another solution: ((obj1, score 1), (obj2, score2), ...)
+        p = evaluation of one solution: (score1, score2, ...)
+        q = evaluation of another solution: (score1, score2, ...)
         """
-        pscores = np.array([score for name, score in p])
-        qscores = np.array([score for name, score in q])
-        score_diffs = qscores - pscores
-        return min(score_diffs) >= 0 and max(score_diffs) > 0.0
+        # compare scores objective by objective (plain loop is faster than numpy for a handful of objectives), stopping
+        # as soon as q beats p on any objective
+        strictly_better = False
+        for pscore, qscore in zip(p, q):
+            if qscore < pscore:
+                return False
+            if qscore > pscore:
+                strictly_better = True
+        return strictly_better
 
     def reduce_nds(self, S, p):
         return S - {q for q in S if self.dominates(p, q)}
 
     def remove_dominated(self):
-        nds = reduce(self.reduce_nds, self.pop.keys(), self.pop.keys())
-        self.pop = {k: self.pop[k] for k in nds}
+        """ Remove all solutions dominated by another solution in the population. Compares every pair of solutions at
+        once using an (N, N, num_objectives) array of score differences instead of pairwise dominates calls. """
+        if len(self.pop) < 2:
+            return
+
+        evals = list(self.pop.keys())
+        scores = np.array(evals)
+
+        # diffs[p, q] = scores of q - scores of p. p dominates q if q is no better on any objective and worse on one.
+        diffs = scores[None, :, :] - scores[:, None, :]
+        dominates = (diffs >= 0).all(axis = 2) & (diffs > 0).any(axis = 2)
+        is_dominated = dominates.any(axis = 0)
+
+        self.pop = {evals[i]: self.pop[evals[i]] for i in np.flatnonzero(~is_dominated)}
 
     @profile
-    def evolve(self, dom=100, status=1000, time_limit=300):
+    def evolve(self, dom=100, status=1000, time_limit=300, batch_size=1):
         """ Run random agents until program hits time limit.
         dom: How frequently to remove dominated solutions
         status: How frequently to output the current population
         time_limit: How long to evolve the population in seconds (300 seconds/5 minutes)
+        batch_size: How many agents to run per iteration (their solutions are scored together)
         """
         agent_names = list(self.agents.keys())
-        # set start time
-        start_time = time.time()
+        # set start time (monotonic clock isn't affected by system clock adjustments)
+        start_time = time.monotonic()
         # track iterations
         iterations = 0
 
         while True:
-            # check if program has reached time limit. if so, stop running.
-            if time.time() - start_time >= time_limit:
+            # check if program has reached time limit every TIME_CHECK_INTERVAL iterations. if so, stop running.
+            if iterations % TIME_CHECK_INTERVAL == 0 and time.monotonic() - start_time >= time_limit:
                 print('Time limit reached. Stopping evolution.')
                 break
 
-            pick = rnd.choice(agent_names)
-            self.run_agent(pick)
+            if batch_size == 1:
+                pick = rnd.choice(agent_names)
+                self.run_agent(pick)
+            else:
+                self.run_agents(rnd.choices(agent_names, k=batch_size))
 
             if iterations % dom == 0:
                 self.remove_dominated()
@@ -95,20 +157,26 @@ class Evo:
                 print('\nIteration: ', iterations)
                 print('Size     :', len(self.pop))
                 # add time in seconds to print statements (used ChatGPT for formatting output)
-                print(f'Time elapsed: {time.time() - start_time:.2f} seconds')
+                print(f'Time elapsed: {time.monotonic() - start_time:.2f} seconds')
                 # update to only print objective function scores for each solution to save time
                 print('Objective evaluations:')
                 for eval in self.pop.keys():
-                    print(dict(eval))
+                    print(dict(zip(self.fitness_names, eval)))
 
             self.remove_dominated()
 
             # increment iteration counter
             iterations += 1
 
+    def evolve_batch(self, dom=100, status=1000, time_limit=300, batch_size=32):
+        """ Run batches of random agents until program hits time limit, scoring each batch's new solutions together
+        with the batch fitness function (trades latency per iteration for throughput). Arguments are the same as
+        evolve, with dom and status counted in batches. """
+        self.evolve(dom=dom, status=status, time_limit=time_limit, batch_size=batch_size)
+
     def __str__(self):
         """ Output the solutions in the population """
         rslt = ''
         for eval, sol in self.pop.items():
-            rslt += str(eval) + ':\t' + str(sol) + '\n'
+            rslt += str(dict(zip(self.fitness_names, eval))) + ':\t' + str(sol) + '\n'
         return rslt
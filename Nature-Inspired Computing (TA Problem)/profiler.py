@@ -30,9 +30,9 @@ class Profiler:
         """ The profiling decorator. """
         def wrapper(*args, **kwargs):
             function_name = str(f).split()[1]
-            start = time.time_ns()
+            start = time.perf_counter_ns()
             val = f(*args, **kwargs)
-            sec = (time.time_ns() - start) / 10**9
+            sec = (time.perf_counter_ns() - start) / 10**9
             Profiler._add(function_name, sec)
             return val
         return wrapper
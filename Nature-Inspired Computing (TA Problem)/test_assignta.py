@@ -1,11 +1,32 @@
 """
-test_assignta.py: Unit test for each objective function to verify that objectives are working correctly
+test_assignta.py: Unit test for each objective function and agent to verify that objectives and agents are working
+correctly
 """
 
+import random
 import pytest
+import numpy as np
 import pandas as pd
+import assignta
 from assignta import (minimize_overallocation, minimize_conflicts, minimize_undersupport, minimize_unwilling,
-                      minimize_unpreferred)
+                      minimize_unpreferred, evaluate_solution, evaluate_solutions, overallocation_minimizer,
+                      conflicts_minimizer, undersupport_minimizer, unwilling_minimizer, unpreferred_minimizer,
+                      shuffle_solutions, mutate_solutions)
+
+
+# define global variables
+
+# load TA preferences, limits, and lab times straight from the csv files so reference agents don't rely on
+# assignta's precomputed arrays
+TA_DATA = pd.read_csv('tas.csv')
+SECTION_DATA = pd.read_csv('sections.csv')
+PREFERENCES = TA_DATA.iloc[:, 3:].to_numpy()
+PREFERRED = PREFERENCES == 'P'
+WILLING = PREFERENCES == 'W'
+UNWILLING = PREFERENCES == 'U'
+MAX_ASSIGNED = TA_DATA['max_assigned'].to_numpy()
+MIN_TA = SECTION_DATA['min_ta'].to_numpy()
+DAYTIMES = SECTION_DATA['daytime'].to_numpy()
 
 
 # define fixtures
@@ -22,6 +43,14 @@ def solution_2():
 def solution_3():
     return pd.read_csv('test3.csv', header = None).to_numpy()
 
+@pytest.fixture
+def random_solutions():
+    # seeded random solutions with sparse to dense assignments (int8 like evolved solutions and int64 like csv tests)
+    rng = np.random.default_rng(3500)
+    solutions = [(rng.random((43, 17)) < density).astype(dtype) for density in (0.05, 0.1, 0.2, 0.4, 0.7)
+                 for dtype in (np.int8, np.int64) for _ in range(4)]
+    return solutions + [pd.read_csv(f'test{i}.csv', header = None).to_numpy() for i in (1, 2, 3)]
+
 
 # write unit tests for each objective function
 
@@ -79,3 +108,180 @@ def test_minimize_unpreferred(solution_1, solution_2, solution_3):
     assert minimize_unpreferred(solution_1) == 15, 'Actual unpreferred total did not match expected total for test1'
     assert minimize_unpreferred(solution_2) == 19, 'Actual unpreferred total did not match expected total for test2'
     assert minimize_unpreferred(solution_3) == 10, 'Actual unpreferred total did not match expected total for test3'
+
+
+def test_evaluate_solutions(random_solutions):
+    # ensure combined (single solution) and batch objective functions match the individual objective functions
+    objectives = [minimize_overallocation, minimize_conflicts, minimize_undersupport, minimize_unwilling,
+                  minimize_unpreferred]
+    expected = [[f(solution) for f in objectives] for solution in random_solutions]
+
+    assert [evaluate_solution(solution) for solution in random_solutions] == expected, \
+        'Combined objective scores did not match individual objective scores'
+    assert evaluate_solutions(random_solutions).tolist() == expected, \
+        'Batch objective scores did not match individual objective scores'
+
+    # ensure batch objective function also accepts a stacked (solutions, TAs, sections) array or a single solution
+    int_solutions = [solution.astype(np.int8) for solution in random_solutions]
+    assert evaluate_solutions(np.stack(int_solutions)).tolist() == expected, \
+        'Batch objective scores for a stacked array did not match individual objective scores'
+    assert evaluate_solutions(random_solutions[0]).tolist() == expected[:1], \
+        'Batch objective scores for a single solution did not match individual objective scores'
+
+
+# define reference (plain loop) agents to check vectorized/compiled agents against
+
+def reference_conflicts_minimizer(solution):
+    # keep each TA's first lab at each time and unassign the rest
+    solution = solution.copy()
+    for ta in range(solution.shape[0]):
+        seen_times = set()
+        for section in np.flatnonzero(solution[ta]):
+            if DAYTIMES[section] in seen_times:
+                solution[ta, section] = 0
+            seen_times.add(DAYTIMES[section])
+    return solution
+
+def reference_overallocation_minimizer(solution):
+    # for each overallocated TA, remove them from their unwilling and willing (but not preferred) sections, then from
+    # the section with the most TAs (first such section on ties) until they are within their max
+    solution = solution.copy()
+    tas_per_section = solution.sum(axis = 0)
+    for ta in np.flatnonzero(solution.sum(axis = 1) > MAX_ASSIGNED):
+        for section in np.flatnonzero(solution[ta] & (UNWILLING[ta] | (WILLING[ta] & ~PREFERRED[ta]))):
+            solution[ta, section] = 0
+            tas_per_section[section] -= 1
+        while solution[ta].sum() > MAX_ASSIGNED[ta]:
+            assigned_sections = np.flatnonzero(solution[ta])
+            section_to_remove = assigned_sections[np.argmax(tas_per_section[assigned_sections])]
+            solution[ta, section_to_remove] = 0
+            tas_per_section[section_to_remove] -= 1
+    return solution
+
+def reference_undersupport_minimizer(solution):
+    # move each available TA from their first assigned section to the first preferred underallocated section (or the
+    # first underallocated section), removing sections from underallocated once they reach min_ta
+    solution = solution.copy()
+    sections_per_ta = solution.sum(axis = 1)
+    tas_per_section = solution.sum(axis = 0)
+    overallocated = list(np.flatnonzero(tas_per_section > MIN_TA))
+    underallocated = list(np.flatnonzero(tas_per_section < MIN_TA))
+    available_tas = [ta for ta in range(solution.shape[0])
+                     if sections_per_ta[ta] == 0 or (solution[ta] & UNWILLING[ta]).any()
+                     or solution[ta, overallocated].any()]
+
+    for ta in available_tas:
+        if sections_per_ta[ta] > MAX_ASSIGNED[ta] or not underallocated:
+            continue
+        preferred_underallocated = [section for section in underallocated if PREFERRED[ta, section]]
+        target_section = preferred_underallocated[0] if preferred_underallocated else underallocated[0]
+        assigned_sections = np.flatnonzero(solution[ta])
+        if assigned_sections.size > 0:
+            solution[ta, assigned_sections[0]] = 0
+            tas_per_section[assigned_sections[0]] -= 1
+            solution[ta, target_section] = 1
+            tas_per_section[target_section] += 1
+            if tas_per_section[target_section] == MIN_TA[target_section]:
+                underallocated.remove(target_section)
+    return solution
+
+def reference_unwilling_minimizer(solution):
+    # move each unwilling assignment to the TA's first preferred section (or first willing section, if any)
+    solution = solution.copy()
+    for ta, section in zip(*np.nonzero((solution == 1) & UNWILLING)):
+        targets = np.flatnonzero(PREFERRED[ta]) if PREFERRED[ta].any() else np.flatnonzero(WILLING[ta])
+        if targets.size > 0:
+            solution[ta, section] = 0
+            solution[ta, targets[0]] = 1
+    return solution
+
+def reference_unpreferred_minimizer(solution):
+    # move each willing (but not preferred) assignment to the first undersupported preferred section (or the TA's first
+    # preferred section, if any)
+    solution = solution.copy()
+    tas_per_section = solution.sum(axis = 0)
+    undersupported_preferred = np.flatnonzero((tas_per_section < MIN_TA) & PREFERRED.any(axis = 0))
+    for ta, section in zip(*np.nonzero((solution == 1) & WILLING & ~PREFERRED)):
+        preferred = np.flatnonzero(PREFERRED[ta])
+        target_section = (undersupported_preferred[0] if undersupported_preferred.size > 0
+                          else preferred[0] if preferred.size > 0 else None)
+        if target_section is not None:
+            solution[ta, section] = 0
+            solution[ta, target_section] = 1
+    return solution
+
+
+# write unit tests for each agent
+
+def test_overallocation_minimizer(random_solutions):
+    for solution in random_solutions:
+        original = solution.copy()
+        result = overallocation_minimizer([solution])
+        assert np.array_equal(solution, original), 'Agent modified input solution'
+        assert np.array_equal(result, reference_overallocation_minimizer(solution)), 'Result did not match reference'
+        assert (result.sum(axis = 1) <= MAX_ASSIGNED).all(), 'A TA is still overallocated'
+
+def test_conflicts_minimizer(random_solutions):
+    for solution in random_solutions:
+        result = conflicts_minimizer([solution])
+        assert np.array_equal(result, reference_conflicts_minimizer(solution)), 'Result did not match reference'
+        assert minimize_conflicts(result) == 0, 'Time conflicts remain after conflicts_minimizer'
+
+def test_undersupport_minimizer(random_solutions):
+    for solution in random_solutions:
+        result = undersupport_minimizer([solution])
+        assert np.array_equal(result, reference_undersupport_minimizer(solution)), 'Result did not match reference'
+        assert minimize_undersupport(result) <= minimize_undersupport(solution), 'Undersupport increased'
+
+def test_undersupport_minimizer_section_order():
+    # sparse solutions leave most sections underallocated, so many balanced sections are removed from the underallocated
+    # list. removals must keep the list in section order, since TAs move to its first preferred (or first) section.
+    rng = np.random.default_rng(2500)
+    for _ in range(250):
+        solution = (rng.random((43, 17)) < rng.uniform(0.02, 0.2)).astype(np.int8)
+        assert np.array_equal(undersupport_minimizer([solution]), reference_undersupport_minimizer(solution)), \
+            'Result did not match reference'
+
+def test_unwilling_minimizer(random_solutions):
+    for solution in random_solutions:
+        result = unwilling_minimizer([solution])
+        assert np.array_equal(result, reference_unwilling_minimizer(solution)), 'Result did not match reference'
+        # unwilling assignments should only be left for TAs with no preferred or willing section to move to
+        has_target = (PREFERRED | WILLING).any(axis = 1)
+        assert not (result[has_target] & UNWILLING[has_target]).any(), \
+            'Unwilling assignments remain after unwilling_minimizer'
+
+def test_unpreferred_minimizer(random_solutions):
+    for solution in random_solutions:
+        result = unpreferred_minimizer([solution])
+        assert np.array_equal(result, reference_unpreferred_minimizer(solution)), 'Result did not match reference'
+
+def test_shuffle_solutions(random_solutions, monkeypatch):
+    # seed agents' random generators so test is repeatable
+    random.seed(3500)
+    monkeypatch.setattr(assignta, 'RNG', np.random.default_rng(3500))
+    num_assignments = 43 * 17
+
+    for solution in random_solutions:
+        original = solution.copy()
+        result = shuffle_solutions([solution])
+        num_flipped = int((result != original).sum())
+
+        # ensure input is untouched, result is binary, and 10-30% of assignments were flipped
+        assert np.array_equal(solution, original), 'Agent modified input solution'
+        assert np.isin(result, (0, 1)).all(), 'Result is not a 0/1 solution'
+        assert int(num_assignments * 0.1) <= num_flipped <= int(num_assignments * 0.3), 'Wrong number of flips'
+
+def test_mutate_solutions(random_solutions, monkeypatch):
+    # seed agents' random generators so test is repeatable
+    random.seed(3500)
+    monkeypatch.setattr(assignta, 'RNG', np.random.default_rng(3500))
+
+    for solution in random_solutions:
+        original = solution.copy()
+        result = mutate_solutions([solution])
+
+        # ensure input is untouched, result is binary with the same dtype, and some (but not most) values flipped
+        assert np.array_equal(solution, original), 'Agent modified input solution'
+        assert np.isin(result, (0, 1)).all() and result.dtype == solution.dtype, 'Result is not a 0/1 solution'
+        assert 0.05 < (result != original).mean() < 0.35, 'Mutation rate outside expected range'
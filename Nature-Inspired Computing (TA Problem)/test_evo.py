@@ -0,0 +1,82 @@
+"""
+test_evo.py: Unit test for evo framework dominance checks, non-dominated filtering, and batch evolution
+"""
+
+import random
+from functools import reduce
+import pytest
+import numpy as np
+from evo import Evo
+
+
+# define fixtures
+
+@pytest.fixture
+def random_evals():
+    # seeded random populations of score tuples (small score range so ties and duplicates are common)
+    rng = np.random.default_rng(3500)
+    return [{tuple(scores) for scores in rng.integers(0, 6, size = (size, num_objectives)).tolist()}
+            for size in (1, 2, 10, 50, 200) for num_objectives in (1, 2, 5)]
+
+@pytest.fixture
+def toy_evo():
+    # two competing objectives over integer vectors (total and distance from 3 in first value), scored one at a time
+    # or in a batch
+    E = Evo()
+    E.add_fitness_criteria('total', lambda x: int(x.sum()))
+    E.add_fitness_criteria('distance', lambda x: int(abs(3 - x[0])))
+    E.add_batch_fitness(lambda xs: np.array([[int(x.sum()), int(abs(3 - x[0]))] for x in xs]))
+
+    def nudge(solutions):
+        solution = solutions[0].copy()
+        solution[random.randrange(len(solution))] += random.choice((-1, 1))
+        return np.clip(solution, 0, 9)
+
+    E.add_agent('nudge', nudge, k=1)
+    E.add_solution(np.full(4, 9))
+    return E
+
+
+# define reference (pairwise) dominance functions to check vectorized methods against
+
+def reference_dominates(p, q):
+    # p dominates q if q is no better on every objective and worse on at least one
+    score_diffs = np.array(q) - np.array(p)
+    return min(score_diffs) >= 0 and max(score_diffs) > 0
+
+
+# write unit tests for evo methods
+
+def test_dominates(random_evals):
+    E = Evo()
+    for evals in random_evals:
+        evals = list(evals)
+        for p in evals[:20]:
+            for q in evals[:20]:
+                assert E.dominates(p, q) == reference_dominates(p, q), f'dominates({p}, {q}) did not match reference'
+
+def test_remove_dominated(random_evals):
+    for evals in random_evals:
+        E = Evo()
+        E.pop = {eval: np.array(eval) for eval in evals}
+
+        # find expected non-dominated set with original pairwise reduce over the population
+        expected = reduce(E.reduce_nds, E.pop.keys(), set(E.pop.keys()))
+
+        E.remove_dominated()
+        assert set(E.pop.keys()) == expected, 'Non-dominated set did not match pairwise reference'
+        assert all(np.array_equal(sol, np.array(eval)) for eval, sol in E.pop.items()), \
+            'Solutions lost their scores'
+
+def test_evolve_batch(toy_evo):
+    random.seed(3500)
+    toy_evo.evolve_batch(dom=10, status=10**9, time_limit=0.2, batch_size=8)
+
+    # ensure population is non-empty, every eval matches its solution, and no solution dominates another
+    assert len(toy_evo.pop) > 0, 'Population is empty after evolve_batch'
+    for eval, sol in toy_evo.pop.items():
+        assert eval == (int(sol.sum()), int(abs(3 - sol[0]))), 'Eval did not match solution scores'
+    for p in toy_evo.pop:
+        assert not any(reference_dominates(q, p) for q in toy_evo.pop), 'Dominated solution left in population'
+    # ensure evolution improved on the starting solution (total of 36, distance of 6)
+    assert min(eval[0] for eval in toy_evo.pop) < 36, 'evolve_batch did not improve population'